@@ -1,8 +1,10 @@
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, Request, request, jsonify, send_from_directory, send_file
 from flask_cors import CORS
 import os
 import logging
+import tempfile
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -11,11 +13,15 @@ load_dotenv()
 
 
 # Import existing utility modules
-from utils.resume_parser import parse_resume, extract_project_section, extract_internship_section
+from utils.resume_parser import (parse_resume_cached, segment_resume, start_pdf_pool, ParseResult,
+                                 extract_project_section, extract_internship_section, extract_education)
 from utils.nlp_processor import NLPProcessor
 from utils.skill_extractor import SkillExtractor
 from utils.job_matcher import JobMatcher
 from utils.ai_coach import AICoach
+from utils.cache import LRUCache, DiskCache, TieredCache
+from utils.parser_pool import ParserPool, ParseFailed
+from utils.memory import process_memory
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='.')
@@ -26,29 +32,78 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Configure upload settings
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'txt', 'docx'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_SPOOL_THRESHOLD = 2 * 1024 * 1024  # uploads above this are spooled to a temp file
 
-# Create uploads directory if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Number of job matches returned by /api/analyze
+TOP_MATCHES = 5
+
+
+
+class SpooledUploadRequest(Request):
+    """Keeps uploaded files in memory, spooling to disk only above UPLOAD_SPOOL_THRESHOLD."""
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_THRESHOLD, mode='rb+')
+
+
+app.request_class = SpooledUploadRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
 # Initialize NLP components (cached globally)
 nlp_processor = None
 skill_extractor = None
 job_matcher = None
 ai_coach = None
+parse_cache = None
+parser_pool = None
 
 
 def initialize_components():
     """Initialize NLP components on startup"""
-    global nlp_processor, skill_extractor, job_matcher, ai_coach
+    global nlp_processor, skill_extractor, job_matcher, ai_coach, parse_cache, parser_pool
     
     try:
+        # Start the parser workers first: their fork server starts before the NLP models load.
+        # Sandboxed workers read each document on their own; without them, long PDFs
+        # are split across the page pool instead.
+        parser_workers = int(os.getenv('PARSER_WORKERS', '2'))
+        if parser_workers > 0:
+            start_pdf_pool(0)
+            parser_pool = ParserPool(
+                workers=parser_workers,
+                timeout=float(os.getenv('PARSER_TIMEOUT', '30')),
+                memory_limit_mb=int(os.getenv('PARSER_MEMORY_MB', '512')),
+                queue_timeout=float(os.getenv('PARSER_QUEUE_TIMEOUT', '10'))
+            )
+        else:
+            start_pdf_pool(int(os.getenv('PDF_WORKERS', '2')))
+
+        # Extracted text of uploads, keyed by file hash; optional sqlite tier shared across restarts
+        parse_cache_db = os.getenv('PARSE_CACHE_DB', '')
+        parse_cache = TieredCache(
+            LRUCache(maxsize=int(os.getenv('PARSE_CACHE_SIZE', '256'))),
+            DiskCache(parse_cache_db, max_bytes=int(os.getenv('PARSE_CACHE_DB_MB', '256')) * 1024 * 1024)
+            if parse_cache_db else None
+        )
+
         logger.info("Initializing NLP components...")
-        nlp_processor = NLPProcessor()
-        skill_extractor = SkillExtractor(nlp_processor)
-        job_matcher = JobMatcher()
+        # Skill matching only needs tokens; entities/noun chunks run their components on demand.
+        # The automaton skill engine works on raw text and doesn't load spaCy's model at all.
+        skill_engine = os.getenv('SKILL_ENGINE', 'spacy')
+        if skill_engine != 'automaton':
+            nlp_processor = NLPProcessor(profile=os.getenv('NLP_PROFILE', 'tokenize-only'),
+                                         strict=os.getenv('NLP_STRICT', '0') == '1',
+                                         vectors=os.getenv('NLP_VECTORS', 'load'))
+        skill_extractor = SkillExtractor(nlp_processor, engine=skill_engine)
+        # Both share one skill vocabulary, so extracted skill ids are used by the matcher as-is
+        job_matcher = JobMatcher(mode=os.getenv('MATCHER_MODE', 'rule'), vocabulary=skill_extractor.vocabulary,
+                                 nlp=nlp_processor.nlp if nlp_processor else None)
+        
+        # Pick up job_roles.json edits without a restart (0 disables)
+        watch_interval = float(os.getenv('CATALOG_WATCH_INTERVAL', '5'))
+        if watch_interval > 0:
+            job_matcher.watch_catalog(watch_interval)
         ai_coach = AICoach()
         logger.info("NLP components initialized successfully!")
     except Exception as e:
@@ -118,30 +173,6 @@ def generate_recommendations(top_matches, skills):
     return recommendations[:7]
 
 
-def extract_education(resume_text):
-    """Extract education information from resume"""
-    education_keywords = [
-        'bachelor', 'master', 'phd', 'doctorate', 'degree',
-        'computer science', 'engineering', 'mba', 'b.tech', 'm.tech',
-        'university', 'college', 'institute', 'graduation'
-    ]
-    
-    education_info = []
-    lines = resume_text.split('\n')
-    
-    for line in lines:
-        line_lower = line.lower()
-        for keyword in education_keywords:
-            if keyword in line_lower and len(line) < 150 and line.strip():
-                education_info.append(line.strip())
-                break
-    
-    # Remove duplicates and limit
-    unique_education = list(dict.fromkeys(education_info))[:3]
-    
-    return '<br>'.join(unique_education) if unique_education else 'Education information not clearly specified'
-
-
 @app.route('/')
 def index():
     """Serve the main HTML page"""
@@ -170,30 +201,34 @@ def upload_file():
         if not allowed_file(file.filename):
             return jsonify({'error': 'Invalid file type. Use PDF, DOCX, or TXT'}), 400
         
-        # Save file temporarily
         filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
         
-        # Extract text from file
+        # Extract text straight from the upload stream (no temp file in uploads/)
         logger.info(f"Extracting text from {filename}")
-        extracted_text = parse_resume(filepath)
-        
-        # Clean up uploaded file
         try:
-            os.remove(filepath)
-        except:
-            pass
+            extracted_text = parse_resume_cached(file.stream, file.filename, parse_cache,
+                                                 parse=parser_pool.parse if parser_pool else None)
+        except ParseFailed as e:
+            logger.warning(f"Parsing {filename} failed ({e.reason}): {e}")
+            status = 503 if e.reason == 'busy' else 422
+            return jsonify({'error': f'Could not process file: {e}', 'reason': e.reason}), status
         
         if not extracted_text or len(extracted_text.strip()) < 50:
             return jsonify({'error': 'Could not extract meaningful text from file'}), 400
         
+        if isinstance(extracted_text, ParseResult) and extracted_text.truncated:
+            logger.warning(f"Partial text from {filename}: {extracted_text.info()}")
+        
         return jsonify({
             'success': True,
             'text': extracted_text,
-            'filename': filename
+            'filename': filename,
+            'extraction': extracted_text.info() if isinstance(extracted_text, ParseResult) else None
         })
     
+    except RequestEntityTooLarge:
+        return jsonify({'error': f'File too large. Maximum size is {MAX_FILE_SIZE // (1024 * 1024)}MB'}), 413
+    
     except Exception as e:
         logger.error(f"Upload error: {e}")
         return jsonify({'error': f'Error processing file: {str(e)}'}), 500
@@ -216,8 +251,8 @@ def analyze_resume():
         
         logger.info("Processing resume with NLP...")
         
-        # Process text with NLP
-        doc = nlp_processor.process_text(resume_text)
+        # Process text with NLP (the automaton skill engine reads the text directly)
+        doc = nlp_processor.process_text(resume_text) if nlp_processor else resume_text
         
         # Extract skills
         logger.info("Extracting skills...")
@@ -225,22 +260,25 @@ def analyze_resume():
         
         # Match jobs
         logger.info(f"Matching jobs... (Target: {target_role if target_role else 'None'})")
-        job_matches = job_matcher.match_jobs(flat_skills, target_role if target_role else None)
+        job_matches = job_matcher.match_jobs(flat_skills, target_role if target_role else None, top_k=TOP_MATCHES)
         
         # Get top 5 matches (UPDATED FROM 3 TO 5 AS REQUESTED)
-        top_matches = job_matches[:5]
+        top_matches = job_matches[:TOP_MATCHES]
         
+        # Split the resume into sections once, shared by the extractors below
+        sections = segment_resume(resume_text)
+
         # Extract education
-        education = extract_education(resume_text)
+        education = extract_education(resume_text, sections)
 
         # Extract and Analyze Projects
         logger.info("Analyzing projects...")
-        project_text = extract_project_section(resume_text)
+        project_text = extract_project_section(resume_text, sections)
         project_analysis = job_matcher.analyze_projects(project_text, flat_skills)
         
         # Extract and Analyze Internships [NEW FEATURE]
         logger.info("Analyzing internships...")
-        internship_text = extract_internship_section(resume_text)
+        internship_text = extract_internship_section(resume_text, sections)
         internship_analysis = job_matcher.analyze_internships(internship_text, flat_skills)
 
         # Generate summary and recommendations
@@ -291,6 +329,24 @@ def chat_with_coach():
         return jsonify({'error': f'Error processing chat: {str(e)}'}), 500
 
 
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_catalog():
+    """Rebuild the job role catalog in the background and swap it in"""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if admin_token:
+        if request.headers.get('X-Admin-Token') != admin_token:
+            return jsonify({'error': 'Unauthorized'}), 401
+    elif request.remote_addr not in ('127.0.0.1', '::1'):
+        return jsonify({'error': 'Set ADMIN_TOKEN to allow remote reloads'}), 403
+    
+    started = job_matcher.reload_catalog()
+    return jsonify({
+        'success': True,
+        'started': started,
+        'catalog': job_matcher.catalog_info()
+    }), 202
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -300,7 +356,18 @@ def health_check():
             'nlp_processor': nlp_processor is not None,
             'skill_extractor': skill_extractor is not None,
             'job_matcher': job_matcher is not None
-        }
+        },
+        'skill_engine': {
+            'engine': skill_extractor.engine,
+            'snapshot': skill_extractor.snapshot_status,
+            'vocabulary_size': len(skill_extractor.vocabulary),
+            'parity': skill_extractor.parity if skill_extractor.engine == 'parity' else None
+        } if skill_extractor else None,
+        'catalog': job_matcher.catalog_info() if job_matcher else None,
+        'match_cache': job_matcher.cache_stats() if job_matcher else None,
+        'parse_cache': parse_cache.stats() if parse_cache else None,
+        'parser_pool': parser_pool.stats() if parser_pool else None,
+        'memory': process_memory()
     })
 
 
@@ -465,7 +465,7 @@ def main():
                 
                 # Radar Chart
                 st.subheader("📊 Skill Distribution")
-                fig_radar = plot_skills_radar(all_skills, skill_extractor.taxonomy)
+                fig_radar = plot_skills_radar(all_skills, skill_extractor.vocabulary)
                 if fig_radar:
                     st.plotly_chart(fig_radar, use_container_width=True)
                 
@@ -0,0 +1,36 @@
+import os
+import sys
+import pickle
+import argparse
+
+# Make the project root importable when run as `python models/build_skill_matcher.py`
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+from utils.nlp_processor import NLPProcessor
+from utils.skill_extractor import build_matcher_snapshot, SKILL_MATCHER_FILE
+from utils.skill_vocabulary import SkillVocabulary
+
+def build_skill_matcher(automaton_only=False):
+    print("Building skill matcher snapshot...")
+    
+    vocabulary = SkillVocabulary.load()
+    
+    # The PhraseMatcher patterns are tokenized with the model the app loads
+    nlp = None if automaton_only else NLPProcessor(profile="tokenize-only").nlp
+    snapshot = build_matcher_snapshot(vocabulary, nlp)
+    
+    output_path = os.path.join(current_dir, SKILL_MATCHER_FILE)
+    with open(output_path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    print(f"Snapshot saved to {output_path}")
+    print(f"{len(vocabulary.taxonomy_phrases())} skills in {len(vocabulary.taxonomy)} categories "
+          f"(vocabulary {snapshot['vocabulary_hash'][:12]}, model {snapshot['model'] or 'none'}).")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompile the skill matchers for fast startup.")
+    parser.add_argument("--automaton-only", action="store_true",
+                        help="skip the spaCy patterns (for workers using the automaton skill engine)")
+    build_skill_matcher(parser.parse_args().automaton_only)
@@ -1,15 +1,21 @@
 import os
+import sys
 import json
 import joblib
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Make the project root importable when run as `python models/train_model.py`
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+from utils.job_matcher import (
+    fit_role_vectors, build_model_meta, VECTORIZER_FILE, MATRIX_FILE, MODEL_META_FILE
+)
 
 def train_models():
     print("Training Job Matching Models...")
     
     # Paths
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
     data_path = os.path.join(project_root, 'data', 'job_roles.json')
     models_dir = os.path.join(project_root, 'models')
     
@@ -17,28 +23,19 @@ def train_models():
     with open(data_path, 'r') as f:
         job_roles = json.load(f)
     
-    # Prepare Corpus
-    corpus = []
-    job_titles = []
-    
-    for title, data in job_roles.items():
-        # Combine required skills into a single string document
-        skills_text = " ".join(data['required_skills'])
-        # Weight important skills by repeating them? (Simple trick)
-        # For now, just simple text
-        corpus.append(skills_text)
-        job_titles.append(title)
-        
-    # TF-IDF Vectorization
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(corpus)
+    # TF-IDF Vectorization (one skills document per role)
+    vectorizer, tfidf_matrix, job_titles = fit_role_vectors(job_roles)
     
     # Save Models
     if not os.path.exists(models_dir):
         os.makedirs(models_dir)
         
-    joblib.dump(vectorizer, os.path.join(models_dir, 'skill_vectorizer.pkl'))
-    joblib.dump(tfidf_matrix, os.path.join(models_dir, 'job_skills_matrix.pkl'))
+    joblib.dump(vectorizer, os.path.join(models_dir, VECTORIZER_FILE))
+    joblib.dump(tfidf_matrix, os.path.join(models_dir, MATRIX_FILE))
+    
+    # Fingerprint of the catalog, so JobMatcher can detect stale artifacts
+    with open(os.path.join(models_dir, MODEL_META_FILE), 'w') as f:
+        json.dump(build_model_meta(job_roles), f, indent=4)
     
     print(f"Models saved to {models_dir}")
     print(f"Trained on {len(job_titles)} job roles.")
@@ -0,0 +1,435 @@
+"""
+Bulk resume analysis: parse every resume in a directory or archive (.zip,
+.tar, .tar.gz), run the same analysis as /api/analyze across worker
+processes and append one JSON record per resume to a JSONL file.
+
+Re-running with the same output file skips resumes already written, so an
+interrupted backfill continues where it stopped.
+
+    python scripts/bulk_analyze.py resumes/ -o results.jsonl -w 8
+"""
+import os
+import gc
+import sys
+import json
+import time
+import signal
+import tarfile
+import zipfile
+import argparse
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Allow running as `python scripts/bulk_analyze.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resume_parser import (parse_resume, is_parse_error, start_pdf_pool, ParseResult, segment_resume,
+                                 extract_project_section, extract_internship_section, extract_education)
+from utils.job_matcher import MODES
+from utils.skill_extractor import ENGINES
+from utils.nlp_processor import VECTOR_MODES
+from utils.memory import process_memory, format_memory
+from utils.parser_pool import limit_memory
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Batches read ahead of the workers (per worker), so archives aren't loaded into memory at once
+READ_AHEAD = 2
+
+# Extra seconds on top of a batch's per-document time limits before its worker
+# is considered stuck (e.g. in native code the in-worker timer can't interrupt)
+STALL_GRACE = 30.0
+
+# Per-worker state, loaded once by _init_worker (or by the parent before
+# forking the workers, with --preload)
+_nlp_processor = None
+_skill_extractor = None
+_job_matcher = None
+_top_k = 5
+_task_timeout = None
+
+
+class DocumentTimeout(Exception):
+    """A resume took longer than the per-document time limit."""
+
+
+@contextmanager
+def _time_limit(seconds):
+    """Raise DocumentTimeout in this (worker) process once `seconds` have passed."""
+    if not seconds or not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise DocumentTimeout(f"took longer than {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _load_components(mode, top_k, skill_engine='spacy', vectors='load'):
+    global _nlp_processor, _skill_extractor, _job_matcher, _top_k
+    from utils.nlp_processor import NLPProcessor
+    from utils.skill_extractor import SkillExtractor
+    from utils.job_matcher import JobMatcher
+
+    if skill_engine != "automaton":
+        _nlp_processor = NLPProcessor(profile="tokenize-only", vectors=vectors)
+    _skill_extractor = SkillExtractor(_nlp_processor, engine=skill_engine)
+    _job_matcher = JobMatcher(mode=mode, vocabulary=_skill_extractor.vocabulary,
+                              nlp=_nlp_processor.nlp if _nlp_processor else None)
+    _top_k = top_k
+
+
+def _init_worker(mode, top_k, skill_engine='spacy', vectors='load', task_timeout=None, memory_mb=0):
+    global _task_timeout
+    # Pool workers can't start the PDF page pool
+    start_pdf_pool(0)
+    if _skill_extractor is None:
+        _load_components(mode, top_k, skill_engine, vectors)
+    _task_timeout = task_timeout
+    # A resume that needs more memory fails with MemoryError instead of taking the box down
+    limit_memory(memory_mb * 1024 * 1024)
+
+
+def preload_components(mode, top_k, skill_engine='spacy', vectors='load'):
+    """
+    Load the model and matchers in this process so forked workers inherit
+    them: their pages stay shared copy-on-write instead of being loaded once
+    per worker. Returns the multiprocessing context to start the workers
+    with, or None (components not preloaded) where fork isn't available.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        print("Preloading needs the fork start method; each worker loads its own copy.", file=sys.stderr)
+        return None
+    _load_components(mode, top_k, skill_engine, vectors)
+    # Keep the collector from touching (and so copying) the inherited objects in the workers
+    gc.collect()
+    gc.freeze()
+    return multiprocessing.get_context('fork')
+
+
+def memory_report(pool_processes):
+    """Per-worker memory lines (USS is what each worker adds on top of the shared pages)."""
+    lines = []
+    total_uss = 0.0
+    for process in sorted(pool_processes, key=lambda p: p.pid):
+        memory = process_memory(process.pid)
+        total_uss += memory["uss_mb"] if memory else 0.0
+        lines.append(f"  {process.name} (pid {process.pid}): {format_memory(memory)}")
+    lines.append(f"  workers: {len(lines)}, total USS {total_uss:.0f} MB; "
+                 f"parent: {format_memory(process_memory())}")
+    return lines
+
+
+def analyze_batch(tasks):
+    """
+    Parse and analyze a batch of resumes; returns their JSON records (with
+    an "error" key on failure). The batch goes through spaCy in one nlp.pipe.
+    """
+    records = []
+    parsed = []  # (record, text) of the resumes with usable text
+    for resume_id, filename, source in tasks:
+        record = {"id": resume_id}
+        records.append(record)
+        try:
+            with _time_limit(_task_timeout):
+                text = parse_resume(source, filename)
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            continue
+        if isinstance(text, ParseResult):
+            record["extraction"] = text.info()
+        if is_parse_error(text) or len(text.strip()) < 50:
+            record["error"] = text if is_parse_error(text) else "Could not extract meaningful text from file"
+        else:
+            parsed.append((record, text))
+
+    try:
+        texts = [text for _, text in parsed]
+        with _time_limit(_task_timeout and _task_timeout * len(texts)):
+            docs = _nlp_processor.process_texts(texts, batch_size=max(len(texts), 1)) if _nlp_processor else texts
+            skills = list(_skill_extractor.extract_skills_batch(docs))
+    except Exception as e:
+        for record, _ in parsed:
+            record["error"] = f"{type(e).__name__}: {e}"
+        return records
+
+    for (record, text), (categorized_skills, flat_skills) in zip(parsed, skills):
+        try:
+            with _time_limit(_task_timeout):
+                sections = segment_resume(text)
+                record.update({
+                    "skills": flat_skills,
+                    "categorized_skills": categorized_skills,
+                    "job_matches": _job_matcher.match_jobs(flat_skills, top_k=_top_k),
+                    "education": extract_education(text, sections),
+                    "project_analysis": _job_matcher.analyze_projects(extract_project_section(text, sections), flat_skills),
+                    "internship_analysis": _job_matcher.analyze_internships(extract_internship_section(text, sections), flat_skills)
+                })
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+    return records
+
+
+def iter_batches(tasks, size):
+    batch = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_resumes(path):
+    """
+    (id, filename, source) for every resume under `path`. Directory entries
+    pass the file path; archive entries pass the bytes. Ids are relative paths.
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    full_path = os.path.join(root, name)
+                    yield os.path.relpath(full_path, path), name, full_path
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS):
+                    yield info.filename, info.filename, archive.read(info)
+    elif tarfile.is_tarfile(path):
+        # Stream mode: members are read in order without loading the index first
+        with tarfile.open(path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(RESUME_EXTENSIONS):
+                    yield member.name, member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"{path} is not a directory, zip or tar archive")
+
+
+def count_resumes(path):
+    """Number of resumes under `path`, or None if it can't be known without reading everything."""
+    if os.path.isdir(path):
+        return sum(1 for root, _, files in os.walk(path) for name in files if name.lower().endswith(RESUME_EXTENSIONS))
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return sum(1 for info in archive.infolist()
+                       if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS))
+    return None
+
+
+def load_checkpoint(output_path):
+    """
+    Ids already written to the output file. A partial last line left by a
+    crash is cut off so appending continues on a clean line.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    valid_end = 0
+    with open(output_path, 'rb') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError, TypeError):
+                break
+            if not line.endswith(b'\n'):
+                break
+            valid_end = f.tell()
+    if valid_end < os.path.getsize(output_path):
+        with open(output_path, 'rb+') as f:
+            f.truncate(valid_end)
+    return done
+
+
+class Progress:
+    """Periodic progress line on stderr: processed, errors, rate and ETA."""
+    def __init__(self, total, every=5.0):
+        self.total = total
+        self.every = every
+        self.done = 0
+        self.errors = 0
+        self.started = time.time()
+        self._last = 0.0
+        self._printed = None
+
+    def update(self, record, force=False):
+        if record is not None:
+            self.done += 1
+            self.errors += "error" in record
+        now = time.time()
+        if force and self._printed == self.done:
+            return
+        if not force and now - self._last < self.every:
+            return
+        self._last = now
+        self._printed = self.done
+        elapsed = max(now - self.started, 1e-9)
+        rate = self.done / elapsed
+        line = f"{self.done}"
+        if self.total:
+            remaining = max(self.total - self.done, 0)
+            eta = f"{remaining / rate / 60:.1f} min" if rate else "?"
+            line += f"/{self.total} ({self.done / self.total:.1%}), ETA {eta}"
+        line += f", {self.errors} errors, {rate:.1f} resumes/s"
+        print(line, file=sys.stderr, flush=True)
+
+
+def run(input_path, output_path, workers, mode='rule', top_k=5, batch_size=16, progress_every=5.0,
+        skill_engine='spacy', vectors='load', preload=False, report_memory=False,
+        task_timeout=120.0, memory_mb=2048):
+    """
+    Analyze every resume not yet in `output_path`, appending one record each.
+    A worker that dies (crash, OOM kill) or gets stuck never stalls the run:
+    its workers are replaced, the batches it took down are retried one
+    resume at a time on their own, and a resume that takes a worker down by
+    itself is written as failed.
+    """
+    done = load_checkpoint(output_path)
+    total = count_resumes(input_path)
+    if total is not None:
+        total = max(total - len(done), 0)
+    if done:
+        print(f"Resuming: {len(done)} resumes already in {output_path}", file=sys.stderr)
+
+    progress = Progress(total, progress_every)
+    window = workers * READ_AHEAD
+    batches = iter_batches((task for task in iter_resumes(input_path) if task[0] not in done), batch_size)
+    # Resumes from batches that were in flight when a worker died; each runs alone
+    suspects = deque()
+    in_flight = {}  # future -> (batch, executor, deadline, isolated)
+
+    ctx = preload_components(mode, top_k, skill_engine, vectors) if preload else None
+
+    def start_executor():
+        return ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                                   initargs=(mode, top_k, skill_engine, vectors, task_timeout, memory_mb))
+
+    def batch_deadline(batch, isolated):
+        if not task_timeout:
+            return None
+        # Parsing, NLP and analysis each get the time limit; a batch may also
+        # queue behind READ_AHEAD others on its worker
+        queued = 1 if isolated else READ_AHEAD + 1
+        return time.time() + queued * (3 * task_timeout * len(batch) + STALL_GRACE)
+
+    executor = start_executor()
+    with open(output_path, 'a', encoding='utf-8') as out:
+
+        def write(records):
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                progress.update(record)
+            # Flushed per batch: a crash loses at most the batches still in flight
+            out.flush()
+
+        def kill_workers():
+            # Stuck workers can't be cancelled; killing them breaks the executor,
+            # which fails every in-flight future with BrokenProcessPool
+            for process in multiprocessing.active_children():
+                process.kill()
+
+        exhausted = False
+        try:
+            while True:
+                # Suspects run one at a time with nothing else in flight, so a crash is theirs alone
+                if suspects:
+                    if not in_flight:
+                        batch = [suspects.popleft()]
+                        in_flight[executor.submit(analyze_batch, batch)] = (batch, executor, batch_deadline(batch, True), True)
+                else:
+                    # Only a bounded number of batches is read ahead of the workers
+                    while not exhausted and len(in_flight) < window:
+                        batch = next(batches, None)
+                        if batch is None:
+                            exhausted = True
+                            break
+                        in_flight[executor.submit(analyze_batch, batch)] = (batch, executor, batch_deadline(batch, False), False)
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+                if not finished:
+                    now = time.time()
+                    if any(deadline is not None and now > deadline for _, _, deadline, _ in in_flight.values()):
+                        print("A worker is stuck past its time limit; restarting the workers.", file=sys.stderr)
+                        kill_workers()
+                        in_flight = {future: (batch, batch_executor, None, isolated)
+                                     for future, (batch, batch_executor, _, isolated) in in_flight.items()}
+                    continue
+
+                broken = False
+                for future in finished:
+                    batch, batch_executor, _, isolated = in_flight.pop(future)
+                    try:
+                        records = future.result()
+                    except BrokenProcessPool:
+                        broken = broken or batch_executor is executor
+                        if isolated:
+                            write([{"id": batch[0][0], "error": "Worker process died while analyzing this resume "
+                                                              "(crash, memory limit or timeout)"}])
+                        else:
+                            suspects.extend(batch)
+                        continue
+                    except Exception as e:
+                        records = [{"id": task[0], "error": f"{type(e).__name__}: {e}"} for task in batch]
+                    write(records)
+
+                if broken:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = start_executor()
+
+            if report_memory:
+                # Measured while the workers are still alive, after they have done their work
+                print("Memory per worker (from /proc/<pid>/smaps_rollup):", file=sys.stderr)
+                for line in memory_report(multiprocessing.active_children()):
+                    print(line, file=sys.stderr)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    progress.update(None, force=True)
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a directory or archive of resumes into a JSONL file.")
+    parser.add_argument("input", help="directory, .zip or .tar(.gz) of PDF/DOCX/TXT resumes")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL output, appended to and used as checkpoint")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes (each loads spaCy once)")
+    parser.add_argument("--mode", default="rule", choices=MODES, help="job matcher scoring mode")
+    parser.add_argument("--top-k", type=int, default=5, help="job matches kept per resume (0 keeps all)")
+    parser.add_argument("--skill-engine", default="spacy", choices=ENGINES,
+                        help="skill matcher; automaton doesn't load the spaCy model")
+    parser.add_argument("--vectors", default="load", choices=VECTOR_MODES,
+                        help="word vectors: loaded per worker, or memory-mapped and shared by all of them")
+    parser.add_argument("--preload", action="store_true",
+                        help="load the model once before forking the workers, so they share its memory")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="print each worker's unique/shared memory at the end")
+    parser.add_argument("--task-timeout", type=float, default=120.0,
+                        help="seconds one resume may take before it is recorded as failed (0 disables)")
+    parser.add_argument("--memory-mb", type=int, default=2048,
+                        help="memory each worker may use on top of the loaded model (0 disables the cap)")
+    parser.add_argument("--batch-size", type=int, default=16, help="resumes per worker task (processed together by nlp.pipe)")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    progress = run(args.input, args.output, max(args.workers, 1), args.mode, args.top_k or None,
+                   max(args.batch_size, 1), args.progress_every, args.skill_engine,
+                   args.vectors, args.preload, args.memory_report, args.task_timeout, args.memory_mb)
+    print(f"Done: {progress.done} resumes, {progress.errors} errors -> {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+import os
+import json
+
+from scripts import bulk_analyze
+
+
+def _crash_on(name, parse):
+    def parse_resume(source, filename):
+        if filename == name:
+            os._exit(1)
+        return parse(source, filename)
+    return parse_resume
+
+
+def test_run_records_a_resume_that_kills_its_worker(tmp_path, monkeypatch):
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    text = "Software engineer with Python, Docker, Kafka and PostgreSQL experience building data pipelines.\n" * 3
+    for i in range(5):
+        (resumes / f"ok{i}.txt").write_text(text)
+    (resumes / "crash.txt").write_text(text)
+    # Forked workers inherit the patched parser
+    monkeypatch.setattr(bulk_analyze, "parse_resume", _crash_on("crash.txt", bulk_analyze.parse_resume))
+    output = tmp_path / "results.jsonl"
+
+    bulk_analyze.run(str(resumes), str(output), workers=2, batch_size=2, progress_every=60,
+                     skill_engine="automaton")
+
+    records = {r["id"]: r for r in map(json.loads, output.read_text().splitlines())}
+    assert sorted(records) == ["crash.txt"] + [f"ok{i}.txt" for i in range(5)]
+    assert "Worker process died" in records["crash.txt"]["error"]
+    assert all("skills" in records[f"ok{i}.txt"] for i in range(5))
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+import spacy
+
+from utils.job_matcher import JobMatcher
+
+
+def test_empty_batch_keeps_ml_enabled():
+    matcher = JobMatcher(mode="hybrid", cache_size=0)
+    results, scores = matcher.match_jobs_batch([], return_scores=True)
+    assert results == []
+    assert scores.shape == (0, len(matcher.role_index))
+    assert matcher.score_matrix([], mode="ml").shape == (0, len(matcher.role_index))
+    assert matcher.models_loaded
+    assert matcher.match_jobs(["Python", "SQL"], top_k=1)
+
+
+def _nlp_with_vectors(words):
+    nlp = spacy.blank("en")
+    rng = np.random.default_rng(0)
+    for word in words:
+        nlp.vocab.set_vector(word, rng.standard_normal(16).astype(np.float32))
+    return nlp
+
+
+def test_role_embeddings_are_only_built_for_semantic_scoring(tmp_path):
+    nlp = _nlp_with_vectors(["python", "sql", "docker", "learning", "machine"])
+    matcher = JobMatcher(mode="rule", cache_size=0, nlp=nlp)
+    matcher.models_dir = str(tmp_path)
+    assert matcher.catalog_info()["embedding_status"] == "deferred"
+
+    matcher.match_jobs(["Python", "SQL"])
+    assert matcher.catalog_info()["embedding_status"] == "deferred"
+
+    assert matcher.match_jobs(["Python", "SQL"], mode="semantic")
+    assert matcher.catalog_info()["embedding_status"] == "built"
+    assert (tmp_path / "role_embeddings.npz").exists()
+
+
+def test_cached_matches_have_the_same_types_as_fresh_ones():
+    matcher = JobMatcher(mode="rule")
+    uncached = JobMatcher(mode="rule", cache_size=0)
+    for top_k in (None, 3):
+        fresh = matcher.match_jobs(["Python", "SQL", "Docker"], top_k=top_k)
+        cached = matcher.match_jobs(["Python", "SQL", "Docker"], top_k=top_k)
+        assert cached == fresh == uncached.match_jobs(["Python", "SQL", "Docker"], top_k=top_k)
+        assert type(cached) is type(fresh)
+        assert all(type(c) is type(f) for c, f in zip(cached, fresh))
+        assert all(type(c[key]) is type(f[key]) for c, f in zip(cached, fresh) for key in f)
+
+        # Callers get their own copy
+        cached[0]["matched_skills"].append("COBOL")
+        assert "COBOL" not in matcher.match_jobs(["Python", "SQL", "Docker"], top_k=top_k)[0]["matched_skills"]
+
+
+def test_top_k_must_be_a_positive_integer():
+    matcher = JobMatcher(mode="rule")
+    for top_k in (0, -1, 2.5, "3", True):
+        with pytest.raises(ValueError):
+            matcher.match_jobs(["Python"], top_k=top_k)
+        with pytest.raises(ValueError):
+            matcher.match_jobs_batch([["Python"]], top_k=top_k)
+    assert len(matcher.match_jobs(["Python"], top_k=np.int64(2))) == 2
+    assert len(matcher.match_jobs_batch([["Python"]], top_k=2)[0]) == 2
+
+
+def test_batch_falls_back_like_match_jobs_without_models():
+    skill_lists = [["Python", "SQL", "Docker"], ["React", "JavaScript"], []]
+    targets = [None, "Frontend Developer", None]
+
+    def assert_batch_matches_single(matcher, mode):
+        batch = matcher.match_jobs_batch(skill_lists, targets, mode=mode)
+        single = [matcher.match_jobs(skills, target, mode=mode) for skills, target in zip(skill_lists, targets)]
+        assert batch == single
+
+    missing = JobMatcher(mode="hybrid", cache_size=0)
+    missing._catalog.models_loaded = False
+    stale = JobMatcher(mode="hybrid", cache_size=0)
+    # Artifacts trained on a different role list
+    stale._catalog.job_vectors = stale._catalog.job_vectors[:-1]
+    for matcher in (missing, stale):
+        for mode in ("ml", "hybrid"):
+            assert_batch_matches_single(matcher, mode)
+            with pytest.raises(RuntimeError):
+                matcher.score_matrix(skill_lists, mode=mode)
+
+    no_vectors = JobMatcher(mode="semantic", cache_size=0)
+    assert_batch_matches_single(no_vectors, "semantic")
+    with pytest.raises(RuntimeError):
+        no_vectors.score_matrix(skill_lists)
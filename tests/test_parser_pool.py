@@ -0,0 +1,19 @@
+import pytest
+
+from utils.parser_pool import ParserPool, ParseFailed
+
+
+def test_oversized_document_fails_with_memory_reason():
+    pool = ParserPool(workers=1, memory_limit_mb=64)
+    try:
+        line = b"Python developer with SQL and Docker experience.\n"
+        # Over the cap on its own, and small enough to be sent but too big to parse
+        for size_mb in (100, 30):
+            with pytest.raises(ParseFailed) as failure:
+                pool.parse(line * (size_mb * 1024 * 1024 // len(line)), "big.txt")
+            assert failure.value.reason == 'memory'
+
+        # The pool keeps serving normal documents
+        assert "Python developer" in pool.parse(line * 20, "resume.txt")
+    finally:
+        pool.close()
@@ -0,0 +1,38 @@
+import os
+from io import BytesIO
+
+import PyPDF2
+
+from utils import resume_parser
+from utils.resume_parser import ParseResult, extract_text_from_pdf, get_pdf_pool, start_pdf_pool
+
+
+def _blank_pdf(pages):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def test_pdf_pool_recovers_after_a_worker_dies():
+    pool = start_pdf_pool(2)
+    try:
+        # A worker exiting abruptly leaves the executor permanently broken
+        try:
+            pool.submit(os._exit, 1).result()
+        except Exception:
+            pass
+        pdf = _blank_pdf(resume_parser.PDF_PARALLEL_MIN_PAGES + 4)
+
+        result = extract_text_from_pdf(pdf)
+        assert isinstance(result, ParseResult)
+        assert result.pages_read == result.total_pages
+
+        # Later documents get a fresh pool, not forked from this (threaded) process
+        assert get_pdf_pool() is not pool
+        assert get_pdf_pool()._mp_context.get_start_method() != 'fork'
+        assert isinstance(extract_text_from_pdf(pdf), ParseResult)
+    finally:
+        start_pdf_pool(0)
@@ -0,0 +1,18 @@
+from utils import skill_extractor
+from utils.skill_extractor import SkillExtractor
+
+
+def test_parity_mismatches_are_logged_once_and_sampled(monkeypatch, capsys):
+    monkeypatch.setattr(skill_extractor, "PARITY_SAMPLES", 2)
+    extractor = SkillExtractor(engine="automaton", snapshot_path="/nonexistent")
+    diffs = [{"spacy_only": [("Data", f"skill {i % 3}")], "automaton_only": []} for i in range(9)]
+    diffs.append({"spacy_only": [], "automaton_only": []})
+    monkeypatch.setattr(extractor, "compare_engines", lambda doc, result: diffs.pop(0))
+
+    for _ in range(10):
+        extractor._check_parity(None, None)
+
+    parity = extractor.parity
+    assert (parity["checked"], parity["mismatched"], parity["distinct"]) == (10, 9, 3)
+    assert len(parity["samples"]) == 2
+    assert capsys.readouterr().out.count("Skill engine mismatch") == 3
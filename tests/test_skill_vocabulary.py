@@ -0,0 +1,26 @@
+from utils.skill_extractor import SkillExtractor
+from utils.skill_vocabulary import SkillVocabulary, get_default_vocabulary
+from utils.job_matcher import JobMatcher
+
+
+def test_canonical_name_is_a_phrase_when_taxonomy_spells_it_differently():
+    vocabulary = SkillVocabulary({"Data": ["Kakfa"]}, {"Kafka": ["Kakfa", "Apache Kafka"]})
+    skill_id = vocabulary.id("Kafka")
+    assert vocabulary.id("Kakfa") == skill_id
+    assert "Kafka" in vocabulary.taxonomy_phrases()[skill_id]
+
+
+def test_extracts_kafka():
+    extractor = SkillExtractor(engine="automaton", snapshot_path="/nonexistent")
+    categorized, skills = extractor.extract_skills("Built streaming pipelines with Kafka and Spark.")
+    assert "Kafka" in skills
+    assert "Kafka" in categorized["Data Science & Analytics"]
+
+
+def test_extracted_kafka_matches_role_requirement():
+    extractor = SkillExtractor(engine="automaton", snapshot_path="/nonexistent")
+    _, skills = extractor.extract_skills("Kafka, Spark and Hadoop")
+    matcher = JobMatcher(vocabulary=get_default_vocabulary(), cache_size=0)
+    big_data = next(m for m in matcher.match_jobs(skills) if m["job_title"] == "Big Data Engineer")
+    assert "kafka" in big_data["matched_skills"]
+    assert "kafka" not in big_data["missing_skills"]
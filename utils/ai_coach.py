@@ -3,9 +3,21 @@ import json
 import random
 import logging
 from datetime import datetime
+from .role_resolver import RoleResolver
 
 logger = logging.getLogger(__name__)
 
+# Short names users type for knowledge base roles
+ROLE_ALIASES = {
+    'frontend': 'Frontend Developer',
+    'backend': 'Backend Developer',
+    'fullstack': 'Full Stack Developer',
+    'data scientist': 'Data Scientist',
+    'ml': 'Machine Learning Engineer',
+    'machine learning': 'Machine Learning Engineer',
+    'devops': 'DevOps Engineer'
+}
+
 class AICoach:
     def __init__(self):
         self.knowledge_base = {}
@@ -23,6 +35,7 @@ class AICoach:
         except Exception as e:
             logger.error(f"❌ Failed to load Knowledge Base: {e}")
             self.knowledge_base = {}
+        self.role_resolver = RoleResolver(self.knowledge_base.get('roles', {}).keys(), ROLE_ALIASES)
 
     def generate_response(self, message, context=None):
         """
@@ -56,40 +69,21 @@ class AICoach:
         roles = self.knowledge_base.get('roles', {})
         detected_role = None
         
-        # Check standard normalized names
-        for role_name in roles.keys():
-            if role_name.lower() in msg_lower:
-                detected_role = role_name
-                break
-        
-        # Check partial/alias matching if exact fail
-        if not detected_role:
-             aliases = {
-                 'frontend': 'Frontend Developer',
-                 'front end': 'Frontend Developer',
-                 'backend': 'Backend Developer',
-                 'back end': 'Backend Developer',
-                 'fullstack': 'Full Stack Developer',
-                 'full stack': 'Full Stack Developer',
-                 'data scientist': 'Data Scientist',
-                 'ml': 'Machine Learning Engineer',
-                 'machine learning': 'Machine Learning Engineer',
-                 'devops': 'DevOps Engineer'
-             }
-             for alias, full_name in aliases.items():
-                 if alias in msg_lower:
-                     detected_role = full_name
-                     break
+        # Role names and aliases mentioned in the message (whole words)
+        idx = self.role_resolver.find_in_text(message)
+        if idx is not None:
+            detected_role = self.role_resolver.names[idx]
         
         # Fallback to context if user implies "it" or "that job" or generally asks without role
         if not detected_role and top_role_context:
             # Only assume context if strictly asking about "the job" or general vague queries
             if any(w in msg_lower for w in ['this', 'that', 'the job', 'my role', 'target', 'for me']):
                  # Try to match the context role to our DB
-                 for role_name in roles.keys():
-                    if role_name.lower() in top_role_context.lower():
-                        detected_role = role_name
-                        break
+                 idx = self.role_resolver.resolve(top_role_context)
+                 if idx is None:
+                     idx = self.role_resolver.find_in_text(top_role_context)
+                 if idx is not None:
+                     detected_role = self.role_resolver.names[idx]
 
         # 3. Intent Handling
         
@@ -1,149 +1,968 @@
 import json
 import os
+import re
+import time
+import hashlib
+import heapq
+import numbers
+import threading
 import numpy as np
 import joblib
+import sklearn
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.exceptions import NotFittedError
+from .cache import LRUCache, freeze, thaw
+from .role_resolver import RoleResolver
+from .skill_vocabulary import get_default_vocabulary
 
-class JobMatcher:
-    def __init__(self):
-        self.job_roles = self._load_job_roles()
-        self.models_loaded = False
+# Generic roles get a 10% penalty so specific matches rank above them
+GENERIC_ROLES = ("Software Engineer", "Software Developer", "Software Test Engineer", "Programmer")
+GENERIC_ROLE_PENALTY = 0.9
+
+# Rule scoring engines: "index" walks the inverted index in Python,
+# "sparse" does one CSR mat-vec over the whole catalog
+ENGINES = ("index", "sparse")
+
+# Scoring modes: weighted rules only, TF-IDF cosine only, a blend of both, or
+# cosine similarity of word-vector embeddings (needs a spaCy model with vectors)
+MODES = ("rule", "ml", "hybrid", "semantic")
+DEFAULT_BLEND_WEIGHTS = {"rule": 0.7, "ml": 0.3}
+
+# Trained TF-IDF artifacts and the fingerprint of the catalog they were built from
+VECTORIZER_FILE = 'skill_vectorizer.pkl'
+MATRIX_FILE = 'job_skills_matrix.pkl'
+MODEL_META_FILE = 'model_meta.json'
+
+# Role x dim semantic embedding matrix, cached by catalog, vocabulary and vectors
+ROLE_EMBEDDINGS_FILE = 'role_embeddings.npz'
+
+
+def role_catalog_hash(job_roles):
+    """
+    SHA-256 of the role catalog. Role order is part of the hash because it
+    fixes the row order of the job skills matrix.
+    """
+    payload = json.dumps(list(job_roles.items()), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_role_corpus(job_roles):
+    """One skills document per role, in catalog order. Returns (titles, corpus)."""
+    job_titles = []
+    corpus = []
+    for title, data in job_roles.items():
+        # Combine required skills into a single string document
+        corpus.append(" ".join(data['required_skills']))
+        job_titles.append(title)
+    return job_titles, corpus
+
+
+def fit_role_vectors(job_roles):
+    """Fit the TF-IDF vectorizer on the catalog. Returns (vectorizer, matrix, titles)."""
+    job_titles, corpus = build_role_corpus(job_roles)
+    vectorizer = TfidfVectorizer()
+    tfidf_matrix = vectorizer.fit_transform(corpus)
+    return vectorizer, tfidf_matrix, job_titles
+
+
+def build_model_meta(job_roles):
+    """Fingerprint stored next to the artifacts by models/train_model.py."""
+    return {
+        "catalog_hash": role_catalog_hash(job_roles),
+        "job_titles": list(job_roles.keys()),
+        "sklearn_version": sklearn.__version__
+    }
+
+
+def _minor_version(version):
+    """Major.minor part of a version string ("1.7.2" -> "1.7"), None if missing."""
+    return ".".join(version.split(".")[:2]) if version else None
+
+
+def _round_scores(values):
+    """
+    Vectorized round(x, 1). np.round can disagree with Python's round() on
+    values that sit on a half, so those few are rounded the Python way.
+    """
+    rounded = np.round(values, 1)
+    scaled = values * 10
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        rounded.flat[i] = round(float(values.flat[i]), 1)
+    return rounded
+
+
+def _check_top_k(top_k):
+    """Raise ValueError unless top_k is None or a positive integer."""
+    if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, numbers.Integral) or top_k < 1):
+        raise ValueError(f"top_k must be None or a positive integer, got {top_k!r}")
+
+
+def _top_indices(scores, k):
+    """
+    Indices of the k best scores, ordered by score descending and catalog
+    order on ties (same as a stable full sort), using a partial selection.
+    """
+    n = len(scores)
+    if k >= n:
+        return np.lexsort((np.arange(n), -scores))
+    kth_score = np.partition(scores, n - k)[n - k]
+    candidates = np.flatnonzero(scores >= kth_score)
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
+
+class KeywordGroups:
+    """
+    Compiled multi-keyword matcher. One regex pass over a (lowercased) text
+    returns the set of groups with at least one keyword in it, with the
+    same substring semantics as `any(k in text for k in keywords)`.
+    """
+    def __init__(self, groups):
+        keywords = sorted({k for ks in groups.values() for k in ks}, key=len, reverse=True)
+        # The pattern reports the longest keyword starting at each position.
+        # Every shorter keyword inside it occurs too, so a hit on a keyword
+        # counts for every group owning one of its substrings.
+        self.groups_for = {
+            k: frozenset(name for name, ks in groups.items() if any(other in k for other in ks))
+            for k in keywords
+        }
+        self.group_count = len(groups)
+        self.pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in keywords) + '))')
+
+    def search(self, text):
+        """Names of the keyword groups occurring in `text`."""
+        hits = set()
+        for m in self.pattern.finditer(text):
+            hits |= self.groups_for[m.group(1)]
+            if len(hits) == self.group_count:
+                break
+        return hits
+
+
+# Keyword groups read by the project heuristics
+PROJECT_KEYWORDS = KeywordGroups({
+    "api": ["api"],
+    "frontend": ["react", "css"],
+    "data": ["data", "model"],
+    "users": ["users", "clients", "customers"],
+    "performance": ["fast", "efficient", "optimized", "performance"],
+    "security": ["secure", "auth", "protection"],
+    "testing": ["test", "testing", "unit", "ci/cd"],
+    "deployment": ["deploy", "hosted", "aws", "cloud", "live"],
+    "metrics": ["metric", "kpi", "result", "improved by"],
+    "lead": ["lead", "led", "managed"],
+    "architect": ["architect", "designed"],
+    "support": ["support", "maintained"],
+    "impact": ["%", "improved", "increased", "reduced", "saved"],
+    "methodology": ["agile", "scrum", "kanban", "ci/cd", "testing"]
+})
+
+# Keywords marking an internship entry as training
+TRAINING_KEYWORDS = KeywordGroups({
+    "training": ['in-plant', 'training', 'workshop', 'course', 'vocational', 'seminar', 'certification']
+})
+
+_YEAR_RE = re.compile(r'\b(19|20)\d\d\b')
+_MONTH_RE = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', re.I)
+_YEAR_SUFFIX_RE = re.compile(r'\b(19|20)\d\d.*')
+_TITLE_PREFIX_RE = re.compile(r'^[\*\-•\d\.\)]+\s*')
+
+
+class RankedMatches(list):
+    """
+    Top-k slice of a match ranking. Only these entries are materialized;
+    `remaining()` builds the rest of the ranking on demand.
+    """
+    def __init__(self, matches, remaining=None):
+        super().__init__(matches)
+        self._remaining = remaining
+
+    def remaining(self):
+        """Match dicts for every role not in this list, in rank order."""
+        return self._remaining() if self._remaining else []
+
+    def full(self):
+        """The complete ranking, same as match_jobs without top_k."""
+        return list(self) + self.remaining()
+
+    def __reduce__(self):
+        # The lazy remainder is tied to this process; pickle the selected matches only
+        return (list, (list(self),))
+
+
+class RoleIndex:
+    """
+    Precompiled view of the role catalog used by rule-based matching.
+    Required skills are interned into the skill vocabulary once here, so
+    a match request only touches the roles that share at least one skill
+    id with the resume (aliases such as "K8s" count as their skill).
+    """
+    def __init__(self, job_roles, vocabulary):
+        self.vocabulary = vocabulary
+        self.titles = []
+        self.descriptions = []
+        self.required_skills = []  # lowercased, catalog order (duplicates kept)
+        self.required_ids = []     # skill ids, parallel to required_skills
+        self.weight_maps = []      # skill id -> weight
+        self.total_weights = []
+        self.penalties = []
+        self.skill_to_roles = {}   # skill id -> [(role index, weight), ...]
+
+        for idx, (role_name, role_data) in enumerate(job_roles.items()):
+            req_skills = [s.lower() for s in role_data['required_skills']]
+            req_ids = [vocabulary.intern(s) for s in role_data['required_skills']]
+
+            # First case-insensitive key wins, default weight is 1.
+            # Weights of skills the role doesn't require are never used.
+            weight_map = {}
+            for k, v in role_data.get('weights', {}).items():
+                skill_id = vocabulary.id(k)
+                if skill_id is not None:
+                    weight_map.setdefault(skill_id, v)
+
+            total_weight = 0
+            role_weights = {}
+            for skill_id in req_ids:
+                w = weight_map.get(skill_id, 1)
+                total_weight += w
+                role_weights[skill_id] = role_weights.get(skill_id, 0) + w
+
+            for skill_id, w in role_weights.items():
+                self.skill_to_roles.setdefault(skill_id, []).append((idx, w))
+
+            self.titles.append(role_name)
+            self.descriptions.append(role_data.get("description", ""))
+            self.required_skills.append(req_skills)
+            self.required_ids.append(req_ids)
+            self.weight_maps.append(weight_map)
+            self.total_weights.append(total_weight)
+            self.penalties.append(GENERIC_ROLE_PENALTY if role_name in GENERIC_ROLES else 1.0)
+
+        # Role x skill CSR weight matrix for the sparse engine, and the
+        # skill id -> column lookup (-1: no role requires the skill)
+        self.skill_columns = {skill_id: col for col, skill_id in enumerate(self.skill_to_roles)}
+        self.column_of = np.full(len(vocabulary), -1, dtype=np.int64)
+        self.column_of[list(self.skill_columns)] = list(self.skill_columns.values())
+        rows, cols, data = [], [], []
+        for skill_id, postings in self.skill_to_roles.items():
+            col = self.skill_columns[skill_id]
+            for idx, w in postings:
+                rows.append(idx)
+                cols.append(col)
+                data.append(w)
+        self.weight_matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float64), (rows, cols)),
+            shape=(len(self.titles), len(self.skill_columns))
+        )
+        self.total_weight_array = np.array(self.total_weights, dtype=np.float64)
+        self.penalty_array = np.array(self.penalties, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def score(self, user_skills):
+        """
+        Weighted match percentage for every role sharing a skill with
+        `user_skills` (a set of skill ids). Returns {role index: score}.
+        """
+        raw = {}
+        for skill in user_skills:
+            for idx, w in self.skill_to_roles.get(skill, ()):
+                raw[idx] = raw.get(idx, 0) + w
+
+        scores = {}
+        for idx, hit_weight in raw.items():
+            total_weight = self.total_weights[idx]
+            final_percentage = (hit_weight / total_weight * 100) if total_weight > 0 else 0
+            scores[idx] = round(final_percentage * self.penalties[idx], 1)
+        return scores
+
+    def related_roles(self, skills, limit=3):
+        """
+        Titles of the `limit` roles requiring the most of `skills`
+        (skill ids), ties in catalog order.
+        """
+        overlap = {}
+        for skill in set(skills):
+            for idx, _ in self.skill_to_roles.get(skill, ()):
+                overlap[idx] = overlap.get(idx, 0) + 1
+        best = heapq.nsmallest(limit, overlap.items(), key=lambda item: (-item[1], item[0]))
+        return [self.titles[idx] for idx, _ in best]
+
+    def _columns(self, user_skills):
+        """Catalog columns of a set of skill ids (skills no role requires are dropped)."""
+        ids = np.fromiter(user_skills, dtype=np.int64, count=len(user_skills))
+        cols = self.column_of[ids[ids < len(self.column_of)]]
+        return cols[cols >= 0]
+
+    def skill_vector(self, user_skills):
+        """Binary skill vector over the catalog's skill columns."""
+        vec = np.zeros(len(self.skill_columns), dtype=np.float64)
+        vec[self._columns(user_skills)] = 1.0
+        return vec
+
+    def skill_matrix(self, user_skill_sets):
+        """Binary resumes x skills CSR matrix, one row per skill id set."""
+        rows, cols = [], []
+        for row, user_skills in enumerate(user_skill_sets):
+            row_cols = self._columns(user_skills)
+            rows.append(np.full(len(row_cols), row, dtype=np.int64))
+            cols.append(row_cols)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+            shape=(len(user_skill_sets), len(self.skill_columns))
+        )
+
+    def _to_scores(self, hits):
+        """Turn matched weight sums into rounded, penalized percentages."""
+        percentages = np.divide(
+            hits, self.total_weight_array,
+            out=np.zeros_like(hits), where=self.total_weight_array > 0
+        ) * 100
+        return _round_scores(percentages * self.penalty_array)
+
+    def score_vector(self, user_skills):
+        """
+        Same scores as `score`, for every role at once, as a dense array.
+        One sparse mat-vec replaces the per-role Python loops.
+        """
+        return self._to_scores(self.weight_matrix @ self.skill_vector(user_skills))
+
+    def score_matrix(self, user_skill_sets):
+        """Scores for many skill sets at once: a resumes x roles array."""
+        hits = (self.skill_matrix(user_skill_sets) @ self.weight_matrix.T).toarray()
+        return self._to_scores(hits)
+
+    def build_match(self, idx, score, user_skills):
+        """Build the match detail dict for one role (`user_skills`: skill ids)."""
+        req_skills = list(zip(self.required_skills[idx], self.required_ids[idx]))
+        return {
+            "job_title": self.titles[idx],
+            "score": score,
+            "matched_skills": [s for s, skill_id in req_skills if skill_id in user_skills],
+            "missing_skills": [s for s, skill_id in req_skills if skill_id not in user_skills],
+            "description": self.descriptions[idx]
+        }
+
+
+class SkillEmbedder:
+    """
+    Word-vector embedding of skills, from the static vectors of a spaCy
+    pipeline: the unit-length mean of the vectors of the skill's tokens
+    (a token without a cased vector falls back to its lowercase form).
+    Vectors are computed once per skill id.
+    """
+    def __init__(self, nlp, vocabulary):
+        self.nlp = nlp
+        self.vocabulary = vocabulary
+        vectors = nlp.vocab.vectors
+        self.dim = vectors.shape[1]
+        self.model_id = f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+        self._vectors = {}  # skill id -> unit vector, None if no token has a vector
+
+    @staticmethod
+    def available(nlp):
+        """True if `nlp` has static word vectors to embed with."""
+        return nlp is not None and nlp.vocab.vectors.shape[0] > 0 and nlp.vocab.vectors.shape[1] > 0
+
+    def vector(self, skill_id):
+        if skill_id in self._vectors:
+            return self._vectors[skill_id]
+        vocab = self.nlp.vocab
+        rows = []
+        for token in self.nlp.make_doc(self.vocabulary.name(skill_id)):
+            for form in (token.text, token.lower_):
+                if vocab.has_vector(form):
+                    rows.append(vocab.get_vector(form))
+                    break
+        vec = None
+        if rows:
+            vec = np.mean(rows, axis=0).astype(np.float32)
+            norm = np.linalg.norm(vec)
+            vec = vec / norm if norm > 0 else None
+        self._vectors[skill_id] = vec
+        return vec
+
+    def embed(self, skill_ids):
+        """Unit-length embedding of a set of skill ids (zeros if none has a vector)."""
+        total = np.zeros(self.dim, dtype=np.float32)
+        for skill_id in skill_ids:
+            vec = self.vector(skill_id)
+            if vec is not None:
+                total += vec
+        norm = np.linalg.norm(total)
+        return total / norm if norm > 0 else total
+
+    def role_matrix(self, role_index):
+        """L2-normalized roles x dim matrix: each role's skills, summed by weight."""
+        matrix = np.zeros((len(role_index), self.dim), dtype=np.float32)
+        for skill_id, postings in role_index.skill_to_roles.items():
+            vec = self.vector(skill_id)
+            if vec is None:
+                continue
+            for idx, w in postings:
+                matrix[idx] += w * vec
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def cache_key(self, catalog):
+        """What the cached role matrix depends on: catalog, skill vocabulary and vectors."""
+        payload = json.dumps([catalog.catalog_hash, self.vocabulary.fingerprint, self.model_id, self.dim])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CatalogSnapshot:
+    """
+    Everything derived from one version of job_roles.json: the roles, the
+    compiled RoleIndex and the TF-IDF artifacts. A snapshot is fully built
+    before it is published and is treated as read-only afterwards, so a
+    reload swaps in a new object while in-flight requests keep the old one.
+    """
+    def __init__(self, job_roles, generation=0, vocabulary=None):
+        self.job_roles = job_roles
+        self.generation = generation
+        self.catalog_hash = role_catalog_hash(job_roles)
+        self.version = f"{generation}-{self.catalog_hash[:12]}"
+        self.role_index = RoleIndex(job_roles, vocabulary or get_default_vocabulary())
+        self.role_resolver = RoleResolver(self.role_index.titles)
         self.vectorizer = None
         self.job_vectors = None
         self.job_titles = []
+        self.models_loaded = False
+        self.model_status = "unavailable"  # "loaded", "rebuilt" or "unavailable"
+        self.role_embeddings = None
+        self.embedding_status = "unavailable"  # "loaded", "built", "deferred" or "unavailable"
+        self.built_at = time.time()
+
+
+class JobMatcher:
+    def __init__(self, engine="index", mode="rule", blend_weights=None, rebuild_stale_models=True,
+                 catalog_path=None, cache_size=1024, cache_ttl=3600, vocabulary=None, nlp=None):
+        """
+        nlp: spaCy pipeline whose static word vectors the "semantic" mode
+        embeds skills with (semantic scoring is off without one)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown matching engine '{engine}'. Expected one of {ENGINES}.")
+        if mode not in MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}'. Expected one of {MODES}.")
+        self.engine = engine
+        self.mode = mode
+        self.blend_weights = self._normalize_blend_weights(blend_weights or DEFAULT_BLEND_WEIGHTS)
+        self.rebuild_stale_models = rebuild_stale_models
+        # Skill ids shared with the SkillExtractor (extracted SkillLists carry them)
+        self.vocabulary = vocabulary or get_default_vocabulary()
+        self.embedder = SkillEmbedder(nlp, self.vocabulary) if SkillEmbedder.available(nlp) else None
+        if mode == "semantic" and self.embedder is None:
+            print("Semantic scoring needs a spaCy model with word vectors. Using rule-based fallback.")
+        
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(current_dir)
+        self.catalog_path = catalog_path or os.path.join(project_root, 'data', 'job_roles.json')
+        self.models_dir = os.path.join(project_root, 'models')
+        
+        # Hot reload state
+        self._reload_lock = threading.Lock()
+        self._embedding_lock = threading.Lock()
+        self._reload_thread = None
+        self._watch_thread = None
+        self.last_reload_seconds = None
+        self.last_reload_error = None
+        
+        # Memoized match_jobs results, keyed by skill set + target + catalog version
+        self._match_cache = LRUCache(cache_size, cache_ttl) if cache_size else None
         
-        # Try to load pre-trained models
-        self._load_models()
+        start = time.perf_counter()
+        self._catalog_mtime = self._get_catalog_mtime()
+        # Load roles and try to load pre-trained models
+        self._catalog = self._build_catalog(self._load_job_roles(), generation=0)
+        self.last_reload_seconds = round(time.perf_counter() - start, 3)
 
-    def _load_job_roles(self):
+    # Views of the current catalog snapshot
+    @property
+    def job_roles(self):
+        return self._catalog.job_roles
+
+    @property
+    def role_index(self):
+        return self._catalog.role_index
+
+    @property
+    def vectorizer(self):
+        return self._catalog.vectorizer
+
+    @property
+    def job_vectors(self):
+        return self._catalog.job_vectors
+
+    @property
+    def job_titles(self):
+        return self._catalog.job_titles
+
+    @property
+    def models_loaded(self):
+        return self._catalog.models_loaded
+
+    @property
+    def model_status(self):
+        return self._catalog.model_status
+
+    @property
+    def catalog_version(self):
+        return self._catalog.version
+
+    def _load_job_roles(self, strict=False):
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(current_dir)
-            data_path = os.path.join(project_root, 'data', 'job_roles.json')
-            with open(data_path, 'r') as f:
+            with open(self.catalog_path, 'r') as f:
                 return json.load(f)
         except Exception:
+            if strict:
+                raise
             return {}
 
-    def _load_models(self):
+    def _get_catalog_mtime(self):
+        try:
+            return os.stat(self.catalog_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _build_catalog(self, job_roles, generation):
+        """Build a complete snapshot (index + models) for `job_roles`."""
+        catalog = CatalogSnapshot(job_roles, generation, self.vocabulary)
+        self._load_models(catalog)
+        if self.mode == "semantic":
+            self._load_role_embeddings(catalog)
+        elif self.embedder is not None:
+            # Only built if a call asks for mode="semantic"
+            catalog.embedding_status = "deferred"
+        return catalog
+
+    def _load_models(self, catalog):
+        """
+        Load the trained TF-IDF artifacts if their fingerprint matches the
+        catalog. Stale or missing artifacts are rebuilt in memory (unless
+        rebuild_stale_models is off), otherwise ML scoring stays off.
+        """
+        vec_path = os.path.join(self.models_dir, VECTORIZER_FILE)
+        matrix_path = os.path.join(self.models_dir, MATRIX_FILE)
+        meta_path = os.path.join(self.models_dir, MODEL_META_FILE)
+        
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(current_dir)
-            models_dir = os.path.join(project_root, 'models')
-            
-            # Load vectorizer if exists
-            vec_path = os.path.join(models_dir, 'skill_vectorizer.pkl')
-            matrix_path = os.path.join(models_dir, 'job_skills_matrix.pkl')
-            
             if os.path.exists(vec_path) and os.path.exists(matrix_path):
-                self.vectorizer = joblib.load(vec_path)
-                self.job_vectors = joblib.load(matrix_path)
-                self.models_loaded = True
-                self.job_titles = list(self.job_roles.keys())
+                stale_reason = self._check_model_meta(meta_path, catalog)
+                if not stale_reason:
+                    vectorizer = joblib.load(vec_path)
+                    job_vectors = joblib.load(matrix_path)
+                    if job_vectors.shape[0] == len(catalog.job_roles):
+                        catalog.vectorizer = vectorizer
+                        catalog.job_vectors = job_vectors
+                        catalog.job_titles = list(catalog.job_roles.keys())
+                        catalog.models_loaded = True
+                        catalog.model_status = "loaded"
+                        return
+                    stale_reason = "matrix rows do not match the catalog"
+                print(f"ML models are stale ({stale_reason}). Run models/train_model.py to refresh them.")
+        except Exception as e:
+            print(f"Could not load ML models: {e}.")
+        
+        if not self.rebuild_stale_models or not catalog.job_roles:
+            print("Using rule-based fallback.")
+            return
+        try:
+            catalog.vectorizer, catalog.job_vectors, catalog.job_titles = fit_role_vectors(catalog.job_roles)
+            catalog.models_loaded = True
+            catalog.model_status = "rebuilt"
+        except Exception as e:
+            print(f"Could not rebuild ML models: {e}. Using rule-based fallback.")
+
+    def _load_role_embeddings(self, catalog):
+        """
+        Role embedding matrix for semantic scoring: read from the cache file
+        if it was built for this catalog, vocabulary and vectors, otherwise
+        built from the word vectors and written back to the cache.
+        """
+        if self.embedder is None or not catalog.job_roles:
+            catalog.embedding_status = "unavailable"
+            return
+        path = os.path.join(self.models_dir, ROLE_EMBEDDINGS_FILE)
+        key = self.embedder.cache_key(catalog)
+        try:
+            if os.path.exists(path):
+                with np.load(path) as cached:
+                    if str(cached["key"]) == key and cached["matrix"].shape == (len(catalog.role_index), self.embedder.dim):
+                        catalog.role_embeddings = cached["matrix"]
+                        catalog.embedding_status = "loaded"
+                        return
+        except Exception as e:
+            print(f"Could not read role embeddings: {e}. Rebuilding them.")
+
+        catalog.role_embeddings = self.embedder.role_matrix(catalog.role_index)
+        catalog.embedding_status = "built"
+        try:
+            # Written under a temporary name and swapped in, so concurrent workers never read half a file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, key=np.array(key), matrix=catalog.role_embeddings)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not cache role embeddings: {e}.")
+
+    def _role_embeddings(self, catalog):
+        """Role embeddings of `catalog` (None if unavailable), built on first use if deferred."""
+        if catalog.embedding_status == "deferred":
+            with self._embedding_lock:
+                if catalog.embedding_status == "deferred":
+                    self._load_role_embeddings(catalog)
+        return catalog.role_embeddings
+
+    def _check_model_meta(self, meta_path, catalog):
+        """Return why the artifacts are stale, or None if they match the catalog."""
+        if not os.path.exists(meta_path):
+            return "no fingerprint found"
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta.get("catalog_hash") != catalog.catalog_hash:
+            return "job_roles.json changed"
+        if meta.get("job_titles") != list(catalog.job_roles.keys()):
+            return "role order changed"
+        # Pickles are only compatible within a minor release; patch upgrades keep them
+        if _minor_version(meta.get("sklearn_version")) != _minor_version(sklearn.__version__):
+            return f"trained with scikit-learn {meta.get('sklearn_version')}"
+        return None
+
+    def reload_catalog(self, wait=False):
+        """
+        Rebuild the catalog from job_roles.json in a background thread and
+        swap it in once complete. Requests already running finish on the
+        old snapshot. Returns False if a reload is already in progress.
+        With wait=True, blocks until the reload has finished.
+        """
+        with self._reload_lock:
+            thread = self._reload_thread
+            started = not (thread and thread.is_alive())
+            if started:
+                thread = threading.Thread(target=self._reload_worker, name="catalog-reload", daemon=True)
+                self._reload_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+        return started
+
+    def _reload_worker(self):
+        start = time.perf_counter()
+        current = self._catalog
+        try:
+            mtime = self._get_catalog_mtime()
+            job_roles = self._load_job_roles(strict=True)
+            if role_catalog_hash(job_roles) == current.catalog_hash:
+                # File touched but content unchanged
+                self._catalog_mtime = mtime
+                self.last_reload_error = None
+                return
+            catalog = self._build_catalog(job_roles, current.generation + 1)
         except Exception as e:
-            print(f"Could not load ML models: {e}. Using rule-based fallback.")
+            self.last_reload_error = str(e)
+            print(f"Catalog reload failed: {e}. Keeping version {current.version}.")
+            return
+        
+        # Single reference swap: a request sees either the old or the new catalog
+        self._catalog = catalog
+        self._catalog_mtime = mtime
+        if self._match_cache is not None:
+            self._match_cache.clear()
+        self.last_reload_seconds = round(time.perf_counter() - start, 3)
+        self.last_reload_error = None
+        print(f"Job catalog reloaded: {len(catalog.role_index)} roles, version {catalog.version} in {self.last_reload_seconds}s")
+
+    def watch_catalog(self, interval=5.0):
+        """Poll job_roles.json every `interval` seconds and reload it when it changes."""
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        
+        def watch():
+            while True:
+                time.sleep(interval)
+                mtime = self._get_catalog_mtime()
+                if mtime is not None and mtime != self._catalog_mtime:
+                    self.reload_catalog()
+        
+        self._watch_thread = threading.Thread(target=watch, name="catalog-watch", daemon=True)
+        self._watch_thread.start()
+
+    def catalog_info(self):
+        """Catalog version and reload status, for health checks."""
+        catalog = self._catalog
+        thread = self._reload_thread
+        return {
+            "version": catalog.version,
+            "roles": len(catalog.role_index),
+            "model_status": catalog.model_status,
+            "embedding_status": catalog.embedding_status,
+            "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(catalog.built_at)),
+            "last_reload_seconds": self.last_reload_seconds,
+            "reloading": bool(thread and thread.is_alive()),
+            "watching": bool(self._watch_thread and self._watch_thread.is_alive()),
+            "last_error": self.last_reload_error
+        }
+
+    def cache_stats(self):
+        """Hit/miss/eviction counters of the match result cache (None if disabled)."""
+        return self._match_cache.stats() if self._match_cache is not None else None
 
-    def match_jobs(self, extracted_skills, target_role=None):
+    def _rule_scores(self, catalog, user_skills, engine=None):
+        """Rule-based score for every role, as an array in catalog order."""
+        engine = engine or self.engine
+        index = catalog.role_index
+        if engine == "sparse":
+            return index.score_vector(user_skills)
+        if engine == "index":
+            scores = np.zeros(len(index), dtype=np.float64)
+            for i, score in index.score(user_skills).items():
+                scores[i] = score
+            return scores
+        raise ValueError(f"Unknown matching engine '{engine}'. Expected one of {ENGINES}.")
+
+    @staticmethod
+    def _normalize_blend_weights(weights):
+        """Scale hybrid blend weights so they sum to 1."""
+        rule_w = float(weights.get("rule", 0))
+        ml_w = float(weights.get("ml", 0))
+        total = rule_w + ml_w
+        if rule_w < 0 or ml_w < 0 or total <= 0:
+            raise ValueError("Blend weights must be non-negative and not all zero.")
+        return {"rule": rule_w / total, "ml": ml_w / total}
+
+    @staticmethod
+    def _ml_available(catalog):
+        """True if the TF-IDF artifacts are loaded and line up with the catalog."""
+        return catalog.models_loaded and catalog.job_vectors.shape[0] == len(catalog.role_index)
+
+    @staticmethod
+    def _ml_scores(catalog, skill_lists):
+        """TF-IDF cosine similarity (percent) for each skill list vs. every role."""
+        user_vectors = catalog.vectorizer.transform([" ".join(skills) for skills in skill_lists])
+        return _round_scores(cosine_similarity(user_vectors, catalog.job_vectors) * 100)
+
+    def _semantic_scores(self, catalog, user_skill_sets):
+        """
+        Cosine similarity (percent, negatives clipped to 0) between each
+        skill set's embedding and every role embedding: one dense mat-vec
+        (a mat-mat for batches) over the precomputed role matrix.
+        """
+        embeddings = catalog.role_embeddings
+        if len(user_skill_sets) == 1:
+            similarity = (embeddings @ self.embedder.embed(user_skill_sets[0]))[np.newaxis, :]
+        else:
+            user_matrix = np.stack([self.embedder.embed(skills) for skills in user_skill_sets])
+            similarity = user_matrix @ embeddings.T
+        return _round_scores(np.clip(similarity.astype(np.float64) * 100, 0, 100))
+
+    def _scores(self, catalog, skill_lists, user_skill_sets, mode, engine=None):
+        """
+        Score matrix (resumes x roles) for the given mode. The TF-IDF
+        transform only runs in "ml" and "hybrid" modes; if the models (or,
+        in "semantic" mode, the role embeddings) are missing or fail,
+        scoring falls back to the rule scores.
+        """
+        if mode == "semantic" and self._role_embeddings(catalog) is not None:
+            return self._semantic_scores(catalog, user_skill_sets)
+        if len(user_skill_sets) == 1:
+            rule_scores = self._rule_scores(catalog, user_skill_sets[0], engine)[np.newaxis, :]
+        else:
+            rule_scores = catalog.role_index.score_matrix(user_skill_sets)
+        if mode in ("rule", "semantic") or not self._ml_available(catalog):
+            return rule_scores
+
+        try:
+            ml_scores = self._ml_scores(catalog, skill_lists)
+        except (NotFittedError, AttributeError) as e:
+            # The artifacts themselves are unusable: disable ML for future calls
+            print(f"ML models are broken: {e}. Using rule-based matching.")
+            catalog.models_loaded = False
+            return rule_scores
+        except Exception as e:
+            # Only this input failed; fall back to the rules for this call
+            print(f"ML matching failed: {e}. Using rule-based matching.")
+            return rule_scores
+
+        if mode == "ml":
+            return ml_scores
+        blended = self.blend_weights["rule"] * rule_scores + self.blend_weights["ml"] * ml_scores
+        return _round_scores(blended)
+
+    def match_jobs(self, extracted_skills, target_role=None, engine=None, top_k=None, mode=None):
         """
         Calculate job matches based on extracted skills.
         If target_role is provided, ensures it is included and prioritized.
+        `engine` overrides the matcher's rule scoring engine for this call,
+        `mode` its scoring mode ("rule", "ml", "hybrid" or "semantic"; semantic
+        needs a JobMatcher built with an nlp that has word vectors, and falls
+        back to the rule scores without one).
+        With top_k, only the best k matches are built (same as slicing the
+        full result) and a RankedMatches list is returned.
+        Results are cached; every call returns its own copy, in the same
+        types whether or not it came from the cache.
         """
-        matches = []
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}'. Expected one of {MODES}.")
+        _check_top_k(top_k)
+        catalog = self._catalog
+        user_skills = self.vocabulary.resolve(extracted_skills)
         
-        # Method 1: ML-based strict matching (Cosine Similarity) - with error handling
-        if self.models_loaded and len(extracted_skills) > 0:
-            try:
-                skill_text = " ".join(extracted_skills)
-                user_vector = self.vectorizer.transform([skill_text])
-                cosine_sims = cosine_similarity(user_vector, self.job_vectors).flatten()
-                
-                for i, score in enumerate(cosine_sims):
-                    matches.append({
-                        "job_title": self.job_titles[i],
-                        "score": round(score * 100, 1),
-                        "method": "ML"
-                    })
-            except Exception as e:
-                # ML model failed, fall back to rule-based matching
-                print(f"ML matching failed: {e}. Using rule-based matching.")
-                self.models_loaded = False  # Disable ML for future calls
+        cache_key = None
+        if self._match_cache is not None:
+            if mode in ("rule", "semantic"):
+                skill_key = user_skills
+            else:
+                # TF-IDF counts repeated skills, so keep duplicates in the key
+                skill_key = tuple(sorted(s.lower() for s in extracted_skills))
+            cache_key = (skill_key, target_role.lower() if target_role else None,
+                         catalog.version, mode, top_k)
+            cached = self._match_cache.get(cache_key)
+            if cached is not None:
+                matches = thaw(cached)
+                return RankedMatches(matches, self._remaining_from(catalog, extracted_skills, target_role, top_k, mode)) \
+                    if top_k else matches
         
-        # Method 2: Rule-based Weighted Matching (Fallback or Hybrid)
-        # We calculate this anyway to get missing skills details
-        rule_matches = []
-        for role_name, role_data in self.job_roles.items():
-            req_skills = [s.lower() for s in role_data['required_skills']]
-            user_skills = [s.lower() for s in extracted_skills]
-            
-            matched = [s for s in req_skills if s in user_skills]
-            missing = [s for s in req_skills if s not in user_skills]
-            weights = role_data.get('weights', {})
-            
-            # Calculate weighted score
-            score = 0
-            total_weight = 0
-            for skill in req_skills:
-                # Default weight 1 if not specified, find actual case-sensitive key
-                w = 1
-                for k, v in weights.items():
-                    if k.lower() == skill:
-                        w = v
-                        break
-                
-                total_weight += w
-                if skill in user_skills:
-                    score += w
-            
-            final_percentage = (score / total_weight * 100) if total_weight > 0 else 0
-            
-            # Penalize generic roles slightly to favor specific matches
-            # If the role is generic, reduce score by 10% (multiply by 0.9)
-            generic_roles = ["Software Engineer", "Software Developer", "Software Test Engineer", "Programmer"]
-            if role_name in generic_roles:
-                final_percentage *= 0.9
-            
-            rule_matches.append({
-                "job_title": role_name,
-                "score": round(final_percentage, 1),
-                "matched_skills": matched,
-                "missing_skills": missing,
-                "description": role_data.get("description", "")
-            })
-            
-        # If ML failed, use rule matches. If ML worked, valid logic would be to combine them.
-        # For simplicity in this v1, we return the detailed rule-based matches matches 
-        # but sorted by score
+        # Matched/missing skill details always come from the weighted rules.
+        # In rule mode only roles sharing a skill with the resume are scored.
+        scores = self._scores(catalog, [extracted_skills], [user_skills], mode, engine)[0]
+        result = self._rank_matches(catalog, scores, user_skills, target_role, top_k)
+        if cache_key is None:
+            return result
         
-        sorted_matches = sorted(rule_matches, key=lambda x: x['score'], reverse=True)
+        # The cache keeps a frozen copy, so callers can't change what later calls get
+        self._match_cache.set(cache_key, freeze(list(result)))
+        return result
+
+    def _remaining_from(self, catalog, extracted_skills, target_role, top_k, mode):
+        """Lazy rest-of-ranking for a cached top-k result; rescored only if asked for."""
+        def remaining():
+            user_skills = self.vocabulary.resolve(extracted_skills)
+            scores = self._scores(catalog, [extracted_skills], [user_skills], mode)[0]
+            return self._rank_matches(catalog, scores, user_skills, target_role, top_k).remaining()
+        return remaining
+
+    def match_jobs_batch(self, skill_lists, target_roles=None, top_k=None, mode=None, return_scores=False):
+        """
+        Match many resumes at once. The whole batch is scored as a single
+        resumes x roles matrix product.
+        `skill_lists` is a list of extracted skill lists, `target_roles` an
+        optional list of target roles aligned with it. Each result list has
+        the same format as `match_jobs`, cut to `top_k` entries if given.
+        With return_scores=True, returns (results, score_matrix), where
+        the matrix rows follow `skill_lists` and columns follow the catalog.
+        """
+        _check_top_k(top_k)
+        if target_roles is None:
+            target_roles = [None] * len(skill_lists)
+        elif len(target_roles) != len(skill_lists):
+            raise ValueError("target_roles must have one entry per skill list")
+
+        catalog = self._catalog
+        user_skill_sets = [self.vocabulary.resolve(skills) for skills in skill_lists]
+        # Same fallbacks as match_jobs: missing ML models or word vectors score by the rules
+        scores = self._score_matrix(catalog, skill_lists, mode, user_skill_sets, strict=False)
+
+        results = []
+        for row, user_skills, target_role in zip(scores, user_skill_sets, target_roles):
+            results.append(self._rank_matches(catalog, row, user_skills, target_role, top_k))
+
+        if return_scores:
+            return results, scores
+        return results
+
+    def score_matrix(self, skill_lists, mode=None):
+        """
+        Raw resumes x roles score matrix (percentages, catalog column order).
+        mode="rule" gives the weighted rule scores, mode="ml" the TF-IDF
+        cosine similarity against the trained job vectors, mode="hybrid"
+        the blend of both, and mode="semantic" the cosine similarity of the
+        word-vector embeddings. Raises RuntimeError if the mode's models
+        are unavailable instead of falling back to the rule scores.
+        """
+        return self._score_matrix(self._catalog, skill_lists, mode)
+
+    def _score_matrix(self, catalog, skill_lists, mode=None, user_skill_sets=None, strict=True):
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}'. Expected one of {MODES}.")
+        if strict:
+            if mode == "semantic" and self._role_embeddings(catalog) is None:
+                raise RuntimeError("Semantic scoring needs a spaCy model with word vectors (JobMatcher(nlp=...)).")
+            if mode in ("ml", "hybrid") and not catalog.models_loaded:
+                raise RuntimeError("ML models are not loaded. Run models/train_model.py first.")
+            if mode in ("ml", "hybrid") and not self._ml_available(catalog):
+                raise RuntimeError("ML models are out of date with job_roles.json. Re-run models/train_model.py.")
+
+        if not skill_lists:
+            return np.zeros((0, len(catalog.role_index)), dtype=np.float64)
+        if user_skill_sets is None:
+            user_skill_sets = [self.vocabulary.resolve(skills) for skills in skill_lists]
+        if mode == "rule":
+            return catalog.role_index.score_matrix(user_skill_sets)
+        return self._scores(catalog, skill_lists, user_skill_sets, mode)
+
+    @staticmethod
+    def _find_target(catalog, scores, target_role):
+        """
+        Index of the role matching target_role: an exact title first (case
+        and punctuation insensitive), then the best-ranked title containing
+        it, then an alias/prefix/fuzzy resolution. None if nothing matches.
+        """
+        resolver = catalog.role_resolver
+        candidates = resolver.exact(target_role)
+        # If not found directly, try fuzzy match (simple containment)
+        if not candidates:
+            candidates = resolver.containing(target_role)
+        if not candidates:
+            return resolver.resolve(target_role)
+        return min(candidates, key=lambda i: (-scores[i], i))
+
+    def _rank_matches(self, catalog, scores, user_skills, target_role=None, top_k=None):
+        """Build the ranked match list for one row of role scores."""
+        index = catalog.role_index
+        
+        if not top_k:
+            # Stable order: score descending, catalog order on ties
+            ranked = np.lexsort((np.arange(len(scores)), -scores))
+            sorted_matches = [index.build_match(i, float(scores[i]), user_skills) for i in ranked]
+        else:
+            sorted_matches = None
         
         # --- TARGET ROLE PRIORITIZATION ---
-        if target_role:
-            target_role_lower = target_role.lower()
-            target_match = None
-            
-            # Find the target role in the results
-            for match in sorted_matches:
-                if match['job_title'].lower() == target_role_lower:
-                    target_match = match
-                    break
-            
-            # If not found directly, try fuzzy match (simple containment)
-            if not target_match:
-                for match in sorted_matches:
-                    if target_role_lower in match['job_title'].lower():
-                        target_match = match
-                        break
-            
-            if target_match:
+        target_idx = self._find_target(catalog, scores, target_role) if target_role else None
+        
+        if sorted_matches is not None:
+            if target_idx is not None:
+                target_title = index.titles[target_idx]
+                target_match = next(m for m in sorted_matches if m['job_title'] == target_title)
                 # Remove it from its current position
                 sorted_matches.remove(target_match)
                 # Mark it as target
                 target_match['is_target'] = True
                 # Insert at the very top (Index 0)
                 sorted_matches.insert(0, target_match)
-                
-        return sorted_matches
+            return sorted_matches
+        
+        # Top-k: partial selection on raw scores, details only for the winners
+        selected = [int(i) for i in _top_indices(scores, top_k) if i != target_idx]
+        if target_idx is not None:
+            selected = [target_idx] + selected[:top_k - 1]
+        top_matches = [index.build_match(i, float(scores[i]), user_skills) for i in selected]
+        if target_idx is not None:
+            top_matches[0]['is_target'] = True
+        
+        def remaining():
+            shown = set(selected)
+            ranked = np.lexsort((np.arange(len(scores)), -scores))
+            return [index.build_match(i, float(scores[i]), user_skills) for i in ranked if i not in shown]
+        
+        return RankedMatches(top_matches, remaining)
 
     def analyze_projects(self, project_text, extracted_skills):
         """
@@ -154,8 +973,6 @@ class JobMatcher:
             return []
 
         # 1. Split Text into Individual Projects (Heuristic)
-        import re
-        
         # Normalize newlines
         text = project_text.replace('\r\n', '\n')
         
@@ -237,13 +1054,15 @@ class JobMatcher:
         raw_projects = unique_projects
 
         analysis_results = []
+        role_index = self._catalog.role_index
+        skills_lower = [(s, s.lower()) for s in extracted_skills]
 
         for idx, p_text in enumerate(raw_projects):
             # Extract Title
             lines = p_text.split('\n')
             title = lines[0].strip()
             # If title is just a bullet or number, remove it
-            title = re.sub(r'^[\*\-•\d\.\)]+\s*', '', title)
+            title = _TITLE_PREFIX_RE.sub('', title)
             # Remove trailing colons
             title = title.strip(':')
             
@@ -251,50 +1070,46 @@ class JobMatcher:
             
             description = " ".join([l.strip() for l in lines[1:]]) if len(lines) > 1 else p_text
             
+            # Lowercase once, then one keyword pass feeds every heuristic below
+            p_lower = p_text.lower()
+            hits = PROJECT_KEYWORDS.search(p_lower)
+            
             # Identify skills
-            p_skills = [s for s in extracted_skills if s.lower() in p_text.lower()]
+            p_skills = [s for s, s_lower in skills_lower if s_lower in p_lower]
             
             # --- Analysis Logic ---
             
             # 1. Summary
             summary = f"A {len(p_skills)}-tech stack project."
-            if "api" in p_text.lower(): summary = "API-driven backend system."
-            elif "react" in p_text.lower() or "css" in p_text.lower(): summary = "Frontend user interface application."
-            elif "data" in p_text.lower() or "model" in p_text.lower(): summary = "Data science / ML implementation."
+            if "api" in hits: summary = "API-driven backend system."
+            elif "frontend" in hits: summary = "Frontend user interface application."
+            elif "data" in hits: summary = "Data science / ML implementation."
             
             # 2. Advantages (Pros)
             advantages = []
             if len(p_skills) >= 3: advantages.append(f"Strong Tech Stack: Integrates {', '.join(p_skills[:3])}.")
-            if any(k in p_text.lower() for k in ['users', 'clients', 'customers']): advantages.append("User-Centric: Addresses real-world user needs.")
+            if "users" in hits: advantages.append("User-Centric: Addresses real-world user needs.")
 
-            if any(k in p_text.lower() for k in ['fast', 'efficient', 'optimized', 'performance']): advantages.append("Performance: Focus on efficiency and optimization.")
-            if any(k in p_text.lower() for k in ['secure', 'auth', 'protection']): advantages.append("Security: Implements security best practices.")
+            if "performance" in hits: advantages.append("Performance: Focus on efficiency and optimization.")
+            if "security" in hits: advantages.append("Security: Implements security best practices.")
             if not advantages: advantages.append("Solid technical implementation.")
 
             # 3. Disadvantages (Cons / Improvements)
             disadvantages = []
-            if not any(k in p_text.lower() for k in ['test', 'testing', 'unit', 'ci/cd']): disadvantages.append("No testing strategy mentioned (Unit/Integration tests).")
-            if not any(k in p_text.lower() for k in ['deploy', 'hosted', 'aws', 'cloud', 'live']): disadvantages.append("Deployment status unclear (is it live?).")
-            if not any(k in p_text.lower() for k in ['metric', 'kpi', 'result', 'improved by']): disadvantages.append("Lacks quantifiable impact metrics (e.g., 'improved X by Y%').")
-            
-            # 4. Role Relevance
-            relevant_roles = set()
-            for role_name, role_data in self.job_roles.items():
-                req_skills = set(s.lower() for s in role_data['required_skills'])
-                matched_proj_skills = set(s.lower() for s in p_skills).intersection(req_skills)
-                if len(matched_proj_skills) >= 1:
-                    relevant_roles.add(role_name)
+            if "testing" not in hits: disadvantages.append("No testing strategy mentioned (Unit/Integration tests).")
+            if "deployment" not in hits: disadvantages.append("Deployment status unclear (is it live?).")
+            if "metrics" not in hits: disadvantages.append("Lacks quantifiable impact metrics (e.g., 'improved X by Y%').")
             
-            # Pick top 3 most relevant based on overlap count
-            sorted_roles = sorted(list(relevant_roles), key=lambda r: len(set(self.job_roles[r]['required_skills']).intersection(set(p_text.lower().split()))), reverse=True)
+            # 4. Role Relevance: top 3 roles by number of project skills they require
+            relevant_roles = role_index.related_roles(self.vocabulary.resolve(p_skills), limit=3)
 
             # Role detected (Restored)
             role_inferred = "Contributor / Developer"
-            if "lead" in p_text.lower() or "led" in p_text.lower() or "managed" in p_text.lower():
+            if "lead" in hits:
                 role_inferred = "Team Lead / Manager"
-            elif "architect" in p_text.lower() or "designed" in p_text.lower():
+            elif "architect" in hits:
                 role_inferred = "System Architect / Core Developer"
-            elif "support" in p_text.lower() or "maintained" in p_text.lower():
+            elif "support" in hits:
                 role_inferred = "Maintenance & Support"
 
             # 5. Project Scoring & Tiering
@@ -304,11 +1119,11 @@ class JobMatcher:
             score += min(len(p_skills) * 4, 20)
             
             # Impact Points (Max 10)
-            if any(k in p_text.lower() for k in ['%', 'improved', 'increased', 'reduced', 'saved']):
+            if "impact" in hits:
                 score += 10
             
             # Methodology Points (Max 10)
-            if any(k in p_text.lower() for k in ['agile', 'scrum', 'kanban', 'ci/cd', 'testing']):
+            if "methodology" in hits:
                 score += 10
                 
             # Role Points (Max 5)
@@ -327,7 +1142,7 @@ class JobMatcher:
                 "description": description[:200] + "..." if len(description) > 200 else description,
                 "advantages": advantages,
                 "disadvantages": disadvantages,
-                "relevance": sorted_roles[:3],
+                "relevance": relevant_roles,
                 "tech_stack": p_skills,
                 "score": score,
                 "tier": tier
@@ -346,7 +1161,6 @@ class JobMatcher:
         # Often internships are listed like:
         # "Role at Company (Date)"
         # "• Detail 1"
-        import re
         text = internship_text.replace('\r\n', '\n')
         
         # Split by blocks that look like new entries
@@ -369,7 +1183,7 @@ class JobMatcher:
             is_header = False
             if not is_bullet:
                 # Check for date patterns roughly (e.g. 2023, Jan '22, present)
-                has_date = bool(re.search(r'\b(19|20)\d\d\b', l) or re.search(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', l, re.I))
+                has_date = bool(_YEAR_RE.search(l) or _MONTH_RE.search(l))
                 if has_date or len(current_entry) > 2:
                     is_header = True
             
@@ -393,6 +1207,7 @@ class JobMatcher:
             entries = [internship_text]
 
         results = []
+        skills_lower = [(s, s.lower()) for s in extracted_skills]
         for entry in entries:
             # Extract Role & Company
             first_line = entry.split('\n')[0].strip()
@@ -409,27 +1224,27 @@ class JobMatcher:
                         role = parts[0].strip()
                         company = parts[1].strip()
                         # Clean up company (remove date)
-                        company = re.sub(r'\b(19|20)\d\d.*', '', company).strip(' ()-')
+                        company = _YEAR_SUFFIX_RE.sub('', company).strip(' ()-')
                         break
             
             if role == "Intern / Trainee" and len(first_line) < 50:
                 role = first_line # Assume the whole line is the header
             
             # Skills used
-            skills_used = [s for s in extracted_skills if s.lower() in entry.lower()]
+            entry_lower = entry.lower()
+            skills_used = [s for s, s_lower in skills_lower if s_lower in entry_lower]
             
             # Key Learnings (from bullets)
             description_lines = [line.strip().lstrip('•-* ') for line in entry.split('\n')[1:] if len(line.strip()) > 10]
             summary = " ".join(description_lines[:2]) if description_lines else entry[len(first_line):].strip()[:150] + "..."
 
             # Classification Logic
-            entry_lower = entry.lower()
             role_lower = role.lower()
             
             # Default to Internship
             entry_type = "Internship"
             
-            if any(k in entry_lower for k in ['in-plant', 'training', 'workshop', 'course', 'vocational', 'seminar', 'certification']):
+            if TRAINING_KEYWORDS.search(entry_lower):
                 entry_type = "Training"
             elif "intern" in role_lower:
                 entry_type = "Internship"
@@ -0,0 +1,40 @@
+# smaps_rollup fields (kB) summed into each reported figure
+_ROLLUP_FIELDS = {
+    "rss_mb": ("Rss",),
+    "pss_mb": ("Pss",),
+    # Unique set size: pages only this process maps, i.e. what it really costs the box
+    "uss_mb": ("Private_Clean", "Private_Dirty"),
+    "shared_mb": ("Shared_Clean", "Shared_Dirty")
+}
+
+
+def process_memory(pid=None):
+    """
+    Memory of a process (default: this one) from /proc/<pid>/smaps_rollup:
+    {"rss_mb", "pss_mb", "uss_mb", "shared_mb"}. Pages shared with other
+    processes (copy-on-write after fork, memory-mapped files) only count
+    towards RSS/shared, so USS is the per-worker cost.
+    Returns None where smaps_rollup isn't available (non-Linux, old kernels).
+    """
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    fields = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1])
+    except (OSError, ValueError):
+        return None
+    return {
+        name: round(sum(fields.get(key, 0) for key in keys) / 1024, 1)
+        for name, keys in _ROLLUP_FIELDS.items()
+    }
+
+
+def format_memory(memory):
+    """One-line summary of a process_memory() result."""
+    if memory is None:
+        return "memory stats unavailable"
+    return (f"USS {memory['uss_mb']:.0f} MB, PSS {memory['pss_mb']:.0f} MB, "
+            f"RSS {memory['rss_mb']:.0f} MB ({memory['shared_mb']:.0f} MB shared)")
@@ -1,30 +1,135 @@
+import os
 import spacy
+import numpy as np
 from spacy.matcher import PhraseMatcher
 import re
 
+# Pipeline profiles: the components process_text runs on every text.
+# "tokenize-only" is all the skill PhraseMatcher (attr="LOWER") needs;
+# None runs the whole loaded pipeline.
+PROFILES = {
+    "tokenize-only": (),
+    "ner": ("tok2vec", "ner"),
+    "full": None
+}
+
+# Components run on demand by extract_entities / get_noun_chunks
+ENTITY_COMPONENTS = ("tok2vec", "ner")
+NOUN_CHUNK_COMPONENTS = ("tok2vec", "tagger", "attribute_ruler", "parser")
+
+# Doc.user_data key listing the components already run on a doc
+_RUN_KEY = "nlp_components"
+
+SPACY_MODEL = "en_core_web_md"
+
+# How the model's static word vectors are held: "load" reads the table into
+# each process's own memory; "mmap" maps the installed model's vectors file
+# read-only, so every process on the machine shares the same page cache
+# pages and only the rows actually looked up are ever read in
+VECTOR_MODES = ("load", "mmap")
+
+
 class NLPProcessor:
-    def __init__(self):
+    def __init__(self, profile="full", strict=False, vectors="load"):
+        """
+        strict: never download the language model at runtime; a missing
+        model raises OSError (install it at build time instead)
+        vectors: "load" or "mmap", see VECTOR_MODES
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown NLP profile '{profile}'. Use one of: {', '.join(PROFILES)}")
+        if vectors not in VECTOR_MODES:
+            raise ValueError(f"Unknown vectors mode '{vectors}'. Use one of: {', '.join(VECTOR_MODES)}")
+        self.profile = profile
+        self.vectors_mode = vectors
         try:
-            self.nlp = spacy.load("en_core_web_md")
+            self.nlp = self._load_model()
         except OSError:
+            if strict:
+                raise OSError(f"spaCy model '{SPACY_MODEL}' is not installed and runtime downloads are disabled. "
+                              f"Install it with: python -m spacy download {SPACY_MODEL}")
             print("Downloading language model...")
             from spacy.cli import download
-            download("en_core_web_md")
-            self.nlp = spacy.load("en_core_web_md")
+            download(SPACY_MODEL)
+            self.nlp = self._load_model()
+
+    def _load_model(self):
+        if self.vectors_mode == "load":
+            return spacy.load(SPACY_MODEL)
+        # Skip spaCy's own read of the vectors table, then map the same file
+        nlp = spacy.load(SPACY_MODEL, exclude=["vectors"])
+        vocab_dir = os.path.join(str(nlp.path), "vocab")
+        vectors_file = os.path.join(vocab_dir, "vectors")
+        if os.path.exists(vectors_file):
+            vectors = nlp.vocab.vectors
+            vectors.data = np.load(vectors_file, mmap_mode="r")
+            # Row keys and settings are small; they are read as usual
+            vectors.from_disk(vocab_dir, exclude=["strings", "vectors"])
+        return nlp
+
+    def _run_components(self, doc, names):
+        """
+        Run the named components (None = all) that haven't run on `doc` yet,
+        in pipeline order. Returns the doc.
+        """
+        done = doc.user_data.setdefault(_RUN_KEY, [])
+        pending = [(name, proc) for name, proc in self.nlp.pipeline
+                   if (names is None or name in names) and name not in done]
+        if not pending:
+            return doc
+        # Listening components read the output tok2vec produced for the doc
+        # just before them, so tok2vec reruns ahead of a lazy batch
+        if pending[0][0] != "tok2vec" and "tok2vec" in self.nlp.pipe_names:
+            pending.insert(0, ("tok2vec", self.nlp.get_pipe("tok2vec")))
+        for name, proc in pending:
+            doc = proc(doc)
+            if name not in done:
+                done.append(name)
+        return doc
+
+    @staticmethod
+    def clean_text(text):
+        """Collapse whitespace, as done before processing."""
+        return re.sub(r'\s+', ' ', text).strip()
 
     def process_text(self, text):
         """
         Process text using Spacy pipeline.
+        Only the components of this processor's profile are run.
         Returns: Doc object
         """
         # Clean text slightly before processing
-        clean_text = re.sub(r'\s+', ' ', text).strip()
-        return self.nlp(clean_text)
+        clean_text = self.clean_text(text)
+        components = PROFILES[self.profile]
+        if components is None:
+            doc = self.nlp(clean_text)
+            doc.user_data[_RUN_KEY] = list(self.nlp.pipe_names)
+            return doc
+        doc = self.nlp.make_doc(clean_text)
+        doc.user_data[_RUN_KEY] = []
+        return self._run_components(doc, components)
+
+    def process_texts(self, texts, batch_size=64, n_process=1):
+        """
+        Process many texts with nlp.pipe (spaCy's internal batching, and
+        `n_process` worker processes if > 1), with the same cleaning and
+        profile as process_text.
+        Yields: Doc objects, in input order
+        """
+        components = PROFILES[self.profile]
+        enabled = [name for name in self.nlp.pipe_names if components is None or name in components]
+        disabled = [name for name in self.nlp.pipe_names if name not in enabled]
+        clean_texts = (self.clean_text(text) for text in texts)
+        for doc in self.nlp.pipe(clean_texts, batch_size=batch_size, n_process=n_process, disable=disabled):
+            doc.user_data[_RUN_KEY] = list(enabled)
+            yield doc
 
     def extract_entities(self, doc):
         """
         Extract standard entities like ORG, GPE, DATE, PERSON
+        (runs the NER components first if the profile skipped them)
         """
+        doc = self._run_components(doc, ENTITY_COMPONENTS)
         entities = {}
         for ent in doc.ents:
             if ent.label_ not in entities:
@@ -35,5 +140,7 @@ class NLPProcessor:
     def get_noun_chunks(self, doc):
         """
         Get noun chunks for potential implicit skills
+        (runs the tagger and parser first if the profile skipped them)
         """
+        doc = self._run_components(doc, NOUN_CHUNK_COMPONENTS)
         return [chunk.text for chunk in doc.noun_chunks]
@@ -0,0 +1,213 @@
+import os
+import time
+import queue
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, workers run without a memory cap
+    resource = None
+
+from . import resume_parser
+from .resume_parser import parse_resume, read_resume_bytes
+from .memory import process_memory
+
+
+class ParseFailed(Exception):
+    """
+    A document could not be parsed in the sandbox. `reason` is one of
+    'timeout', 'crashed', 'memory', 'error' or 'busy' (no worker free in time).
+    """
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def limit_memory(limit_bytes):
+    """Cap the address space of the current process at its present size plus `limit_bytes`."""
+    if resource is None or not limit_bytes:
+        return
+    # Forked workers inherit the parent's mappings, so the cap sits on top of them
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        current = 0
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + limit_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker_main(conn, memory_limit):
+    limit_memory(memory_limit)
+    # Each worker reads its document on its own; no nested page pool
+    resume_parser.start_pdf_pool(0)
+    while True:
+        try:
+            data, filename = conn.recv()
+        except (EOFError, OSError):
+            return
+        except MemoryError:
+            # The document alone is over the cap; the pipe is mid-message, so this worker is done
+            conn.send((False, ('memory', "Document needs more memory than allowed")))
+            return
+        try:
+            result = (True, parse_resume(data, filename))
+        except MemoryError:
+            result = (False, ('memory', "Document needs more memory than allowed"))
+        except Exception as e:
+            result = (False, ('error', str(e)))
+        try:
+            conn.send(result)
+        except MemoryError:
+            conn.send((False, ('memory', "Document needs more memory than allowed")))
+
+
+class _Worker:
+    """One sandboxed parser process and the pipe to it."""
+    def __init__(self, ctx, slot, memory_limit):
+        self.slot = slot
+        self.tasks = 0
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, memory_limit),
+                                   name=f"resume-parser-{slot}", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+
+class ParserPool:
+    """
+    Pre-forked worker processes that run parse_resume in isolation: each
+    worker has an RLIMIT_AS memory cap, each document a hard timeout. A worker
+    that times out, dies or has served `max_tasks` documents is replaced.
+    Failures are raised as ParseFailed; latency and failures are kept per worker.
+    """
+    def __init__(self, workers=2, timeout=30.0, memory_limit_mb=512, max_tasks=200, queue_timeout=10.0):
+        self.timeout = timeout
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else 0
+        self.max_tasks = max_tasks
+        self.queue_timeout = queue_timeout
+        # Replacement workers come from the fork server too, never from the threaded server
+        self._ctx = resume_parser.worker_context()
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers = []
+        self._stats = []
+        for slot in range(workers):
+            worker = _Worker(self._ctx, slot, self.memory_limit)
+            self._workers.append(worker)
+            self._stats.append({
+                "slot": slot, "tasks": 0, "failures": 0, "timeouts": 0, "crashes": 0,
+                "restarts": 0, "total_ms": 0.0, "max_ms": 0.0
+            })
+            self._idle.put(worker)
+
+    def parse(self, source, filename=None):
+        """
+        parse_resume(source, filename) in a worker process. Returns the text
+        (or parse_resume's error string); raises ParseFailed if the worker
+        timed out, crashed or ran out of memory.
+        """
+        if filename is None and isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        data = read_resume_bytes(source)
+        # A worker holds the received message and the unpickled bytes at once; a
+        # document that can't fit twice would only kill the worker mid-read
+        if self.memory_limit and 2 * len(data) > self.memory_limit:
+            raise ParseFailed('memory', "Document needs more memory than allowed")
+
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise ParseFailed('busy', "All parser workers are busy")
+
+        started = time.monotonic()
+        try:
+            worker.conn.send((data, filename))
+        except OSError:
+            # The worker went down while reading the document: with a cap, that's the cap
+            ok, payload = False, ('memory', "Document needs more memory than allowed") if self.memory_limit \
+                else ('crashed', "Parser worker died while reading the document")
+        else:
+            try:
+                if worker.conn.poll(self.timeout):
+                    ok, payload = worker.conn.recv()
+                else:
+                    ok, payload = False, ('timeout', f"Parsing took longer than {self.timeout:g}s")
+            except (EOFError, OSError):
+                ok, payload = False, ('crashed', "Parser worker died while reading the document")
+        elapsed = (time.monotonic() - started) * 1000
+
+        stats = self._stats[worker.slot]
+        worker.tasks += 1
+        stats["tasks"] += 1
+        stats["total_ms"] += elapsed
+        stats["max_ms"] = max(stats["max_ms"], elapsed)
+        if not ok:
+            stats["failures"] += 1
+            if payload[0] == 'timeout':
+                stats["timeouts"] += 1
+            elif payload[0] == 'crashed':
+                stats["crashes"] += 1
+
+        # A failed worker may be stuck or damaged; long-lived ones are recycled to cap leaks
+        if not ok or worker.tasks >= self.max_tasks or not worker.process.is_alive():
+            worker = self._replace(worker)
+        if worker is not None:
+            self._idle.put(worker)
+
+        if not ok:
+            raise ParseFailed(*payload)
+        return payload
+
+    def _replace(self, worker):
+        worker.stop()
+        with self._lock:
+            if self._closed:
+                return None
+            replacement = _Worker(self._ctx, worker.slot, self.memory_limit)
+            self._workers[worker.slot] = replacement
+            self._stats[worker.slot]["restarts"] += 1
+            return replacement
+
+    def stats(self):
+        """Per-worker counters, latency and memory, plus totals."""
+        per_worker = []
+        for stats, worker in zip(self._stats, self._workers):
+            tasks = stats["tasks"]
+            per_worker.append({
+                **stats,
+                "pid": worker.process.pid,
+                "total_ms": round(stats["total_ms"], 1),
+                "max_ms": round(stats["max_ms"], 1),
+                "avg_ms": round(stats["total_ms"] / tasks, 1) if tasks else 0.0,
+                "memory": process_memory(worker.process.pid)
+            })
+        return {
+            "workers": len(per_worker),
+            "idle": self._idle.qsize(),
+            "timeout": self.timeout,
+            "memory_limit_mb": self.memory_limit // (1024 * 1024),
+            "tasks": sum(w["tasks"] for w in per_worker),
+            "failures": sum(w["failures"] for w in per_worker),
+            "per_worker": per_worker
+        }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.stop()
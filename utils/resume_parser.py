@@ -1,248 +1,654 @@
 import os
+import re
+import time
+import hashlib
+import zipfile
+import threading
+import multiprocessing
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from xml.etree import ElementTree
 import PyPDF2
 import docx
 
-def extract_text_from_pdf(file_bytes):
-    """Extract text from a PDF file."""
+# PDF extraction budgets: a resume never needs more than this, and a huge or
+# pathological PDF must not hold a request thread for long
+PDF_MAX_PAGES = 50
+PDF_MAX_CHARS = 100000
+PDF_TIME_BUDGET = 15.0  # seconds of wall-clock time per document
+
+# Documents with at least this many pages are read in chunks across worker processes
+PDF_PARALLEL_MIN_PAGES = 12
+PDF_CHUNK_PAGES = 6
+PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+# Part of every parse cache key; bump when extraction output changes so old entries are ignored
+PARSE_CACHE_VERSION = 2
+
+_pdf_pool = None
+_pdf_workers = PDF_WORKERS
+_pdf_pool_lock = threading.Lock()
+
+
+def _forget_pdf_pool():
+    # A forked child can't use the parent's executor (its threads don't exist there)
+    global _pdf_pool, _pdf_pool_lock
+    _pdf_pool = None
+    _pdf_pool_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_pdf_pool)
+
+
+class ParseResult(str):
+    """
+    Extracted text. Behaves as a plain string and also records how much of
+    the document was read: pages_read, total_pages, and whether (and why)
+    extraction stopped early.
+    """
+    def __new__(cls, text, pages_read=0, total_pages=0, reason=None):
+        result = super().__new__(cls, text)
+        result.pages_read = pages_read
+        result.total_pages = total_pages
+        result.reason = reason  # None, 'max_pages', 'max_chars' or 'deadline'
+        return result
+
+    @property
+    def truncated(self):
+        return self.reason is not None
+
+    def info(self):
+        return {
+            "pages_read": self.pages_read,
+            "total_pages": self.total_pages,
+            "truncated": self.truncated,
+            "reason": self.reason
+        }
+
+
+def worker_context():
+    """
+    Multiprocessing context for parser worker processes. Workers, including
+    ones started later to replace dead workers, are forked from a fork
+    server rather than from this process, which by then runs request threads
+    and holds their locks. The server preloads the application and parser
+    modules, so workers start cheaply. Platforms without forkserver use
+    their default start method.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    ctx = multiprocessing.get_context('forkserver')
+    ctx.set_forkserver_preload(['__main__', __name__])
+    return ctx
+
+
+def get_pdf_pool():
+    """Process pool for page-parallel PDF extraction, created on first use (None if disabled)."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None and _pdf_workers > 0:
+            _pdf_pool = ProcessPoolExecutor(max_workers=_pdf_workers, mp_context=worker_context())
+        return _pdf_pool
+
+
+def _discard_pdf_pool(pool):
+    """Drop a broken pool (a worker died) so the next get_pdf_pool() starts fresh workers."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def start_pdf_pool(workers=PDF_WORKERS):
+    """
+    Start the PDF worker processes now (0 disables page-parallel extraction),
+    so the first long PDF doesn't wait for them. A pool broken by a dead
+    worker is replaced on the next get_pdf_pool().
+    """
+    global _pdf_pool, _pdf_workers
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+        _pdf_workers = workers
+    pool = get_pdf_pool()
+    if pool is not None:
+        pool.submit(int).result()
+    return pool
+
+
+def iter_pdf_pages(source, start=0, stop=None, deadline=None):
+    """
+    Yield (page number, text) for the pages of a PDF (bytes or a PdfReader),
+    one page at a time. Stops before page `stop`, or once `deadline`
+    (a time.time() value) has passed.
+    """
+    reader = source if isinstance(source, PyPDF2.PdfReader) else PyPDF2.PdfReader(BytesIO(source))
+    stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+    for number in range(start, stop):
+        if deadline is not None and time.time() >= deadline:
+            return
+        yield number, reader.pages[number].extract_text() or ""
+
+
+def _extract_page_range(file_bytes, start, stop, deadline):
+    # Runs in a worker process; returns fewer pages if the deadline passes
+    return [text for _, text in iter_pdf_pages(file_bytes, start, stop, deadline)]
+
+
+def _iter_pages_parallel(pool, file_bytes, page_limit, deadline):
+    """
+    Page texts in order, extracted in chunks by the pool. If a worker dies,
+    the pool is replaced for later documents and this one is finished on
+    the calling thread.
+    """
+    chunks = [(start, min(start + PDF_CHUNK_PAGES, page_limit)) for start in range(0, page_limit, PDF_CHUNK_PAGES)]
+    futures = []
+    next_page = 0
     try:
-        pdf_reader = PyPDF2.PdfReader(BytesIO(file_bytes))
-        text = ""
-        for page in pdf_reader.pages:
-            # Add newline to prevent pages from gluing together
-            text += (page.extract_text() or "") + "\n"
-        return text
+        futures = [pool.submit(_extract_page_range, file_bytes, start, stop, deadline) for start, stop in chunks]
+        for (start, stop), future in zip(chunks, futures):
+            timeout = None if deadline is None else max(deadline - time.time(), 0)
+            try:
+                pages = future.result(timeout=timeout)
+            except FutureTimeout:
+                return
+            next_page = start + len(pages)
+            yield from pages
+            if len(pages) < stop - start:
+                return
+    except BrokenProcessPool:
+        _discard_pdf_pool(pool)
+        yield from (text for _, text in iter_pdf_pages(file_bytes, next_page, page_limit, deadline))
+    finally:
+        # Stop queued chunks once the caller has enough text or time is up
+        for future in futures:
+            future.cancel()
+
+
+def extract_text_from_pdf(file_bytes, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS,
+                          time_budget=PDF_TIME_BUDGET, parallel=True):
+    """
+    Extract text from a PDF file, page by page, reading at most `max_pages`
+    pages and `max_chars` characters within `time_budget` seconds.
+    Large documents are read across the worker pool. Returns a ParseResult.
+    """
+    try:
+        deadline = time.time() + time_budget if time_budget else None
+        reader = PyPDF2.PdfReader(BytesIO(file_bytes))
+        total_pages = len(reader.pages)
+        page_limit = min(total_pages, max_pages) if max_pages else total_pages
+
+        pool = get_pdf_pool() if parallel and page_limit >= PDF_PARALLEL_MIN_PAGES else None
+        if pool is not None:
+            pages = _iter_pages_parallel(pool, file_bytes, page_limit, deadline)
+        else:
+            pages = (text for _, text in iter_pdf_pages(reader, 0, page_limit, deadline))
+
+        parts = []
+        chars = 0
+        try:
+            for page_text in pages:
+                # Add newline to prevent pages from gluing together
+                parts.append(page_text + "\n")
+                chars += len(page_text) + 1
+                # Stop early once there is enough text
+                if max_chars and chars >= max_chars:
+                    break
+        finally:
+            pages.close()
+
+        text = "".join(parts)
+        reason = None
+        if max_chars and chars >= max_chars and (chars > max_chars or len(parts) < page_limit):
+            text = text[:max_chars]
+            reason = 'max_chars'
+        elif len(parts) < page_limit:
+            reason = 'deadline'
+        elif page_limit < total_pages:
+            reason = 'max_pages'
+        return ParseResult(text, len(parts), total_pages, reason)
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
-def extract_text_from_docx(file_path):
-    """Extract text from a DOCX file."""
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_DOCX_PART_RE = re.compile(r'word/(header|document|footer)(\d*)\.xml$')
+_DOCX_PART_ORDER = {'header': 0, 'document': 1, 'footer': 2}
+
+
+def _docx_parts(names):
+    """Header, body and footer parts of a DOCX archive, in reading order."""
+    parts = []
+    for name in names:
+        m = _DOCX_PART_RE.match(name)
+        if m:
+            parts.append((_DOCX_PART_ORDER[m.group(1)], int(m.group(2) or 0), name))
+    return [name for _, _, name in sorted(parts)]
+
+
+def iter_docx_lines(xml_file):
+    """
+    Stream one WordprocessingML part with iterparse and yield its text in
+    document order: one line per paragraph, one line per table row with the
+    cells separated by tabs. Text boxes are read once (mc:Fallback copies skipped).
+    """
+    paragraphs = []  # runs of the open paragraphs (text box paragraphs nest inside others)
+    tables = []      # open tables: finished lines, cells of the current row, paragraphs of the current cell
+    skip = 0         # depth inside mc:Fallback
+    tab_stops = 0    # depth inside w:tabs (tab stop definitions, not text)
+
+    for event, elem in ElementTree.iterparse(xml_file, events=('start', 'end')):
+        tag = elem.tag
+        if tag == _MC_FALLBACK:
+            skip += 1 if event == 'start' else -1
+            continue
+        if tag == _W + 'tabs':
+            tab_stops += 1 if event == 'start' else -1
+            continue
+        if skip:
+            continue
+
+        if event == 'start':
+            if tag == _W + 'p':
+                paragraphs.append([])
+            elif tag == _W + 'tbl':
+                tables.append({'lines': [], 'row': [], 'cell': []})
+            continue
+
+        if not paragraphs and tag not in (_W + 'tc', _W + 'tr', _W + 'tbl'):
+            continue
+        if tag == _W + 't':
+            paragraphs[-1].append(elem.text or '')
+        elif tag in (_W + 'tab', _W + 'ptab'):
+            if not tab_stops:
+                paragraphs[-1].append('\t')
+        elif tag == _W + 'br':
+            # Page and column breaks are layout only
+            if elem.get(_W + 'type', 'textWrapping') == 'textWrapping':
+                paragraphs[-1].append('\n')
+        elif tag == _W + 'cr':
+            paragraphs[-1].append('\n')
+        elif tag == _W + 'noBreakHyphen':
+            paragraphs[-1].append('-')
+        elif tag == _W + 'p':
+            text = ''.join(paragraphs.pop())
+            elem.clear()
+            if tables:
+                tables[-1]['cell'].append(text)
+            else:
+                yield text
+        elif tag == _W + 'tc':
+            table = tables[-1]
+            table['row'].append(' '.join(t.strip() for t in table['cell'] if t.strip()))
+            table['cell'] = []
+        elif tag == _W + 'tr':
+            table = tables[-1]
+            table['lines'].append('\t'.join(table['row']))
+            table['row'] = []
+        elif tag == _W + 'tbl':
+            table = tables.pop()
+            elem.clear()
+            if tables:
+                # Nested table: its rows become part of the enclosing cell
+                tables[-1]['cell'].extend(table['lines'])
+            else:
+                yield from table['lines']
+
+
+def extract_text_from_docx(source):
+    """
+    Extract text from a DOCX file (a path or a binary file-like object):
+    headers, body and footers, including tables and text boxes. Falls back
+    to python-docx (body paragraphs only) if the archive can't be streamed.
+    """
     try:
-        doc = docx.Document(file_path)
+        lines = []
+        with zipfile.ZipFile(source) as archive:
+            for name in _docx_parts(archive.namelist()):
+                with archive.open(name) as part:
+                    lines.extend(iter_docx_lines(part))
+        return "\n".join(lines)
+    except Exception:
+        pass
+
+    try:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        doc = docx.Document(source)
         return "\n".join([paragraph.text for paragraph in doc.paragraphs])
     except Exception as e:
         return f"Error reading DOCX: {str(e)}"
 
-def parse_resume(file_path):
-    """Parse resume file and extract text based on extension."""
-    ext = os.path.splitext(file_path)[1].lower()
-    
+def _decode_text(data):
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = data.decode('latin-1')
+    # Same newline handling as reading the file in text mode
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def parse_resume(source, filename=None):
+    """
+    Parse resume file and extract text based on extension.
+    `source` is a file path, the file's bytes or a binary file-like object
+    (e.g. an upload stream); for bytes and streams, `filename` gives the extension.
+    """
+    if filename is None:
+        if isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        else:
+            filename = getattr(source, 'name', None)
+    ext = os.path.splitext(filename)[1].lower() if isinstance(filename, str) else ''
+
+    if ext not in ('.pdf', '.docx', '.txt'):
+        return "Unsupported file format"
+
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            if ext == '.docx':
+                return extract_text_from_docx(source)
+            with open(source, 'rb') as f:
+                data = f.read()
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            # python-docx reads the (seekable) stream directly
+            if ext == '.docx':
+                return extract_text_from_docx(source)
+            data = source.read()
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
+
     if ext == '.pdf':
-        try:
-            with open(file_path, 'rb') as f:
-                return extract_text_from_pdf(f.read())
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+        return extract_text_from_pdf(data)
     elif ext == '.docx':
-        return extract_text_from_docx(file_path)
-    elif ext == '.txt':
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except Exception as e:
-                return f"Error reading TXT: {str(e)}"
+        return extract_text_from_docx(BytesIO(data))
     else:
-        return "Unsupported file format"
+        return _decode_text(data)
+
+def is_parse_error(text):
+    """Whether parse_resume returned an error message instead of text."""
+    return not text or text.startswith(("Error reading", "Unsupported file format"))
+
+def read_resume_bytes(source):
+    """Contents of a resume given as a path, bytes or a binary file-like object."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    return source.read()
 
-def extract_project_section(text):
+def parse_resume_cached(source, filename=None, cache=None, parse=None):
     """
-    Extracts the 'Projects' section from the resume text using line-based heuristics.
+    parse_resume behind a content-addressed cache (e.g. a TieredCache), keyed by
+    the SHA-256 of the file's bytes and its extension. Re-uploads of the same
+    file skip extraction. Errors and deadline-truncated results are not cached.
+    `parse(data, filename)` replaces parse_resume, e.g. ParserPool.parse.
     """
-    # Normalize text
-    lines = text.split('\n')
-    
-    # Common headers for project sections
-    project_headers = [
-        'projects', 'academic projects', 'personal projects', 'key projects', 
+    parse = parse or parse_resume
+    if cache is None:
+        return parse(source, filename)
+    if filename is None and isinstance(source, (str, os.PathLike)):
+        filename = os.fspath(source)
+    ext = os.path.splitext(filename)[1].lower() if isinstance(filename, str) else ''
+
+    try:
+        data = read_resume_bytes(source)
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
+
+    key = f"v{PARSE_CACHE_VERSION}:{hashlib.sha256(data).hexdigest()}{ext}"
+    text = cache.get(key)
+    if text is not None:
+        return text
+
+    text = parse(data, filename)
+    if not is_parse_error(text) and getattr(text, 'reason', None) != 'deadline':
+        cache.set(key, text)
+    return text
+
+# Section headers recognised by segment_resume, keyed by section label
+SECTION_HEADERS = {
+    'projects': [
+        'projects', 'academic projects', 'personal projects', 'key projects',
         'technical projects', 'project experience', 'projects undertaken',
         'selected projects', 'major projects', 'professional projects',
-        'project details', 'projects summary', 'key initiatives', 
+        'project details', 'projects summary', 'key initiatives',
         'development experience', 'significant projects'
-    ]
-    
-    # Common headers for other sections (to find the end of projects)
-    # Added more specific "Experience" variations to avoid false positives inside text
-    other_headers = [
-        'education', 'skills', 'technical skills', 'key skills', 'skills & achievements',
+    ],
+    'internships': [
+        'internships', 'internship', 'internship experience', 'industrial training',
+        'in-plant training', 'vocational training', 'apprenticeship',
+        'summer internship', 'winter internship'
+    ],
+    'experience': [
         'experience', 'work experience', 'employment', 'professional experience',
-        'achievements', 'certifications', 'awards', 'languages', 'interests',
-        'references', 'declaration', 'summary', 'profile', 'objective', 
-        'competitive programming', 'courses', 'publications', 'patents',
-        'extra-curricular', 'leadership', 
-        # Internship headers to ensure strict separation
-        'internships', 'internship', 'industrial training', 
-        'in-plant training', 'vocational training'
-    ]
-    
-    start_idx = -1
-    end_idx = -1
-    
-    for i, line in enumerate(lines):
-        # Clean line for checking: lowercase, remove non-alphanumeric at ends
-        line_clean = line.strip().lower()
-        # Remove common header suffixes/prefixes like delimiters
-        line_clean = line_clean.strip(':-|•* #')
-        
-        if not line_clean:
-            continue
-            
-        # Check start
-        if start_idx == -1:
-            # We look for exact match or strong containment for headers
-            if any(line_clean == h for h in project_headers):
-                start_idx = i + 1
+        'work history'
+    ],
+    'education': ['education'],
+    'skills': ['skills', 'technical skills', 'key skills', 'skills & achievements'],
+    'achievements': ['achievements', 'awards'],
+    'certifications': ['certifications', 'courses'],
+    'summary': ['summary', 'profile', 'objective'],
+    'languages': ['languages'],
+    'interests': ['interests'],
+    'references': ['references'],
+    'declaration': ['declaration'],
+    'competitive programming': ['competitive programming'],
+    'publications': ['publications', 'patents'],
+    'activities': ['extra-curricular', 'leadership']
+}
+
+# Start/end headers of the project section
+PROJECT_HEADERS = SECTION_HEADERS['projects']
+PROJECT_END_HEADERS = [
+    'education', 'skills', 'technical skills', 'key skills', 'skills & achievements',
+    'experience', 'work experience', 'employment', 'professional experience',
+    'achievements', 'certifications', 'awards', 'languages', 'interests',
+    'references', 'declaration', 'summary', 'profile', 'objective',
+    'competitive programming', 'courses', 'publications', 'patents',
+    'extra-curricular', 'leadership',
+    # Internship headers to ensure strict separation
+    'internships', 'internship', 'industrial training',
+    'in-plant training', 'vocational training'
+]
+
+# Start/end headers of the internship section
+INTERNSHIP_HEADERS = [
+    'internships', 'internship experience', 'industrial training',
+    'in-plant training', 'vocational training', 'apprenticeship',
+    'summer internship', 'winter internship', 'work history',
+    'professional experience', 'experience' # Generic fallback
+]
+INTERNSHIP_END_HEADERS = [
+    'education', 'skills', 'technical skills', 'key skills',
+    'projects', 'academic projects', 'achievements', 'certifications',
+    'awards', 'languages', 'interests', 'references', 'declaration',
+    'summary', 'profile', 'objective'
+]
+
+_HEADER_LABELS = {h: label for label, headers in SECTION_HEADERS.items() for h in headers}
+
+
+def _build_header_trie(headers):
+    trie = {}
+    for h in headers:
+        node = trie
+        for ch in h:
+            node = node.setdefault(ch, {})
+        node[None] = h
+    return trie
+
+_HEADER_TRIE = _build_header_trie(set(_HEADER_LABELS) | set(PROJECT_END_HEADERS) | set(INTERNSHIP_HEADERS)
+                                  | set(INTERNSHIP_END_HEADERS))
+
+
+def _header_prefixes(line_clean):
+    """Every known header the cleaned line starts with, shortest first."""
+    found = []
+    node = _HEADER_TRIE
+    for ch in line_clean:
+        node = node.get(ch)
+        if node is None:
+            break
+        if None in node:
+            found.append(node[None])
+    return found
+
+
+def _is_header(line_clean, h):
+    """Whether a line starting with header `h` reads as that header rather than as a sentence."""
+    # Too long to be a header
+    if len(line_clean) > 40:
+        return False
+    remainder = line_clean[len(h):].strip()
+    if not remainder or remainder in [':', '-', '|']:
+        return True
+    # Multi-word headers ("Work Experience") may carry a short suffix,
+    # single words ("Experience") must not be the start of a sentence
+    if ' ' in h:
+        return len(line_clean) < len(h) + 10
+    return len(line_clean.split()) <= 3
+
+
+class ResumeSections:
+    """
+    Result of segment_resume: the resume lines, the lines that look like
+    section headers, and the labelled sections with line and character offsets.
+    """
+    def __init__(self, text):
+        self.lines = text.split('\n')
+        self.header_lines = []  # (line index, cleaned line, header prefixes)
+        self.sections = []      # dicts with label/header/start/end/start_offset/end_offset
+
+        offsets = []
+        pos = 0
+        for i, line in enumerate(self.lines):
+            offsets.append(pos)
+            pos += len(line) + 1
+            # Clean line for checking: lowercase, remove delimiters at the ends
+            line_clean = line.strip().lower().strip(':-|•* #')
+            if not line_clean:
                 continue
-            
-            # Allow "Projects: <Description>" to trigger start, but keep the description
-            for h in project_headers:
-                if line_clean.startswith(h) and len(line_clean) < len(h) + 5: # "Projects:"
-                     start_idx = i + 1
-                     break
-
-        # Check end
-        if start_idx != -1:
-            # If we hit another header, stop
-            is_header = False
-            for h in other_headers:
-                # Exact match
-                if line_clean == h:
-                    is_header = True
-                    break
-                
-                # Starts with header (e.g., "Education Details")
-                # BUT be careful: "Experience with Python" is NOT "Experience" header
-                if line_clean.startswith(h):
-                    # Check if the rest is just generic characters or short
-                    remainder = line_clean[len(h):].strip()
-                    if not remainder or remainder in [':', '-', '|']:
-                        is_header = True
-                        break
-                    
-                    # If it's a known multi-word header like "Work Experience", startswith is fine
-                    # But for single words like "Experience", we need to be careful
-                    if ' ' in h: 
-                         if len(line_clean) < len(h) + 10:
-                             is_header = True
-                             break
-                    else:
-                        # For single word headers, ensure it's not a sentence
-                        if len(line_clean.split()) <= 3: 
-                            is_header = True
-                            break
-
-            if is_header:
-                # Double check: is this line too long to be a header?
-                if len(line_clean) > 40:
-                    is_header = False
-
-                if is_header:
-                    end_idx = i
+            prefixes = _header_prefixes(line_clean)
+            if prefixes:
+                self.header_lines.append((i, line_clean, prefixes))
+        offsets.append(pos)
+
+        # Label every header line by its most specific matching header
+        for i, line_clean, prefixes in self.header_lines:
+            for h in reversed(prefixes):
+                if h in _HEADER_LABELS and _is_header(line_clean, h):
+                    if self.sections:
+                        self.sections[-1]['end'] = i
+                    self.sections.append({'label': _HEADER_LABELS[h], 'header': self.lines[i].strip(),
+                                          'start': i + 1, 'end': len(self.lines)})
                     break
-                
-    if start_idx != -1:
+        for section in self.sections:
+            section['start_offset'] = offsets[section['start']]
+            section['end_offset'] = max(offsets[section['end']] - 1, section['start_offset'])
+
+    def labels(self):
+        """Section labels in resume order."""
+        return [section['label'] for section in self.sections]
+
+    def get(self, label):
+        """Text of every section with this label, joined; "" if there is none."""
+        parts = [self._join(section['start'], section['end']) for section in self.sections if section['label'] == label]
+        return "\n".join(p for p in parts if p)
+
+    def extract(self, start_headers, end_headers, start_slack):
+        """
+        Text between the first start header and the next end header after it.
+        A start line may also be "<header> <short suffix>" (under `start_slack`
+        extra characters); such a line is still checked as a possible end.
+        """
+        start_headers = set(start_headers)
+        end_headers = set(end_headers)
+        start_idx = -1
+        end_idx = -1
+        for i, line_clean, prefixes in self.header_lines:
+            if start_idx == -1:
+                if line_clean in start_headers:
+                    start_idx = i + 1
+                    continue
+                if not any(h in start_headers and len(line_clean) < len(h) + start_slack for h in prefixes):
+                    continue
+                start_idx = i + 1
+            if any(h in end_headers and _is_header(line_clean, h) for h in prefixes):
+                end_idx = i
+                break
+
+        if start_idx == -1:
+            return ""
         if end_idx == -1:
-            end_idx = len(lines)
-        
-        # Post-processing: remove empty lines from start/end
-        section_lines = lines[start_idx:end_idx]
+            end_idx = len(self.lines)
+        return self._join(start_idx, end_idx)
+
+    def _join(self, start, end):
+        # Drop empty lines around the section
+        section_lines = self.lines[start:end]
         while section_lines and not section_lines[0].strip():
             section_lines.pop(0)
         while section_lines and not section_lines[-1].strip():
             section_lines.pop()
-            
         return "\n".join(section_lines).strip()
-        
-    return ""
 
-def extract_internship_section(text):
+
+def segment_resume(text):
+    """
+    Split resume text into labelled sections (projects, internships,
+    experience, education, skills, ...) in a single pass over its lines.
+    """
+    return ResumeSections(text)
+
+
+def extract_project_section(text, sections=None):
+    """
+    Extracts the 'Projects' section from the resume text using line-based heuristics.
+    Pass the result of segment_resume to reuse an existing segmentation.
+    """
+    sections = sections or segment_resume(text)
+    # Allow "Projects: <Description>" to trigger start, but keep the description
+    return sections.extract(PROJECT_HEADERS, PROJECT_END_HEADERS, start_slack=5)
+
+
+def extract_internship_section(text, sections=None):
     """
     Extracts the 'Internship' or 'Training' section from the resume text.
+    Pass the result of segment_resume to reuse an existing segmentation.
     """
-    # Normalize text
-    lines = text.split('\n')
-    
-    # Common headers for internship sections
-    internship_headers = [
-        'internships', 'internship experience', 'industrial training', 
-        'in-plant training', 'vocational training', 'apprenticeship',
-        'summer internship', 'winter internship', 'work history', 
-        'professional experience', 'experience' # Generic fallback
-    ]
-    
-    # Common headers for OTHER sections (to find the end)
-    other_headers = [
-        'education', 'skills', 'technical skills', 'key skills', 
-        'projects', 'academic projects', 'achievements', 'certifications', 
-        'awards', 'languages', 'interests', 'references', 'declaration', 
-        'summary', 'profile', 'objective'
-    ]
-    
-    start_idx = -1
-    end_idx = -1
+    sections = sections or segment_resume(text)
+    return sections.extract(INTERNSHIP_HEADERS, INTERNSHIP_END_HEADERS, start_slack=10)
+
+
+EDUCATION_KEYWORDS = [
+    'bachelor', 'master', 'phd', 'doctorate', 'degree',
+    'computer science', 'engineering', 'mba', 'b.tech', 'm.tech',
+    'university', 'college', 'institute', 'graduation'
+]
+EDUCATION_RE = re.compile('|'.join(re.escape(k) for k in EDUCATION_KEYWORDS))
+
+
+def _education_lines(text):
+    education_info = []
+    for line in text.split('\n'):
+        if line.strip() and len(line) < 150 and EDUCATION_RE.search(line.lower()):
+            education_info.append(line.strip())
+    # Remove duplicates and limit
+    return list(dict.fromkeys(education_info))[:3]
+
+
+def extract_education(resume_text, sections=None):
+    """Extract education information from resume"""
+    # Look inside the Education section first, the whole resume only if it has nothing
+    sections = sections or segment_resume(resume_text)
+    unique_education = _education_lines(sections.get('education'))
+    if not unique_education:
+        unique_education = _education_lines(resume_text)
     
-    for i, line in enumerate(lines):
-        line_clean = line.strip().lower().strip(':-|•* #')
-        
-        if not line_clean:
-            continue
-            
-        # Check start
-        if start_idx == -1:
-            if any(line_clean == h for h in internship_headers):
-                start_idx = i + 1
-                continue
-            
-            # Check for "Experience" combined with "Intern" in the same line?
-            # Or reliance on specific headers. 
-            # If "Experience" header is found, we might want to check if the content *looks* like internship
-            # But let's stick to headers for now.
-            for h in internship_headers:
-                 if line_clean.startswith(h) and len(line_clean) < len(h) + 10:
-                     start_idx = i + 1
-                     break
-
-        # Check end
-        if start_idx != -1:
-            is_header = False
-            for h in other_headers:
-                if line_clean == h:
-                    is_header = True
-                    break
-                
-                if line_clean.startswith(h):
-                    remainder = line_clean[len(h):].strip()
-                    if not remainder or remainder in [':', '-', '|']:
-                        is_header = True
-                        break
-                    if ' ' in h: 
-                         if len(line_clean) < len(h) + 10:
-                             is_header = True
-                             break
-                    else:
-                        if len(line_clean.split()) <= 3: 
-                            is_header = True
-                            break
-
-            if is_header:
-                if len(line_clean) > 40: is_header = False
-                if is_header:
-                    end_idx = i
-                    break
-                
-    if start_idx != -1:
-        if end_idx == -1:
-            end_idx = len(lines)
-        
-        section_lines = lines[start_idx:end_idx]
-        while section_lines and not section_lines[0].strip():
-            section_lines.pop(0)
-        while section_lines and not section_lines[-1].strip():
-            section_lines.pop()
-            
-        return "\n".join(section_lines).strip()
-        
-    return ""
+    return '<br>'.join(unique_education) if unique_education else 'Education information not clearly specified'
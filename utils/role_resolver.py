@@ -0,0 +1,223 @@
+import re
+
+# Abbreviations expanded word by word in role names and queries
+TOKEN_ALIASES = {
+    'ml': 'machine learning',
+    'eng': 'engineer',
+    'engr': 'engineer',
+    'dev': 'developer',
+    'devs': 'developer',
+    'mgr': 'manager',
+    'admin': 'administrator',
+    'sr': 'senior',
+    'jr': 'junior'
+}
+
+# Split compounds joined into one word, so "Front-End" == "front end" == "Frontend"
+COMPOUND_WORDS = {
+    ('front', 'end'): 'frontend',
+    ('back', 'end'): 'backend',
+    ('full', 'stack'): 'fullstack',
+    ('dev', 'ops'): 'devops'
+}
+
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+# Minimum trigram similarity for a fuzzy (typo-tolerant) match
+FUZZY_THRESHOLD = 0.6
+
+
+def normalize_role(text):
+    """Lowercase, strip punctuation, join compounds and expand abbreviations."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    joined = []
+    i = 0
+    while i < len(tokens):
+        pair = tuple(tokens[i:i + 2])
+        if pair in COMPOUND_WORDS:
+            joined.append(COMPOUND_WORDS[pair])
+            i += 2
+        else:
+            joined.append(tokens[i])
+            i += 1
+    return " ".join(TOKEN_ALIASES.get(t, t) for t in joined)
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class RoleResolver:
+    """
+    Resolves free-form role queries ("ml eng", "full-stack", "Front End Dev")
+    to role names. Built once per role list:
+    - a hash map of normalized names, plus an alias table,
+    - a character trie over normalized names for prefix lookups,
+    - a trigram index for substring candidates and fuzzy matching.
+    Lookups return indexes into `names`.
+    """
+    def __init__(self, names, aliases=None):
+        self.names = list(names)
+        self.names_lower = [n.lower() for n in self.names]
+        self.normalized = [normalize_role(n) for n in self.names]
+
+        self._lower_map = {}  # raw lowercased name -> index
+        self._exact = {}      # normalized name -> [indexes]
+        for idx, (lower, norm) in enumerate(zip(self.names_lower, self.normalized)):
+            self._lower_map.setdefault(lower, idx)
+            self._exact.setdefault(norm, []).append(idx)
+
+        self._aliases = {}    # normalized alias -> index
+        for alias, target in (aliases or {}).items():
+            target_ids = self._exact.get(normalize_role(target))
+            if target_ids:
+                self._aliases.setdefault(normalize_role(alias), target_ids[0])
+
+        # Phrase lookups in free text try at most this many words
+        phrases = list(self._exact) + list(self._aliases)
+        self._max_words = max((len(p.split()) for p in phrases), default=0)
+
+        # Trie: each node keeps the shortest name below it as the prefix answer
+        self._trie = {}
+        for idx, norm in enumerate(self.normalized):
+            node = self._trie
+            for ch in norm:
+                node = node.setdefault(ch, {})
+                best = node.get(None)
+                if best is None or len(norm) < len(self.normalized[best]):
+                    node[None] = idx
+
+        # Trigram postings: raw + normalized names for substring candidates,
+        # normalized names only for fuzzy similarity
+        self._grams = {}
+        self._norm_grams = {}
+        self._norm_gram_counts = []
+        for idx, (lower, norm) in enumerate(zip(self.names_lower, self.normalized)):
+            norm_grams = _trigrams(norm)
+            for gram in _trigrams(lower) | norm_grams:
+                self._grams.setdefault(gram, set()).add(idx)
+            for gram in norm_grams:
+                self._norm_grams.setdefault(gram, []).append(idx)
+            self._norm_gram_counts.append(len(norm_grams))
+
+    def __len__(self):
+        return len(self.names)
+
+    def exact(self, query):
+        """Indexes whose name equals the query, case-insensitively or after normalization."""
+        idx = self._lower_map.get(query.lower())
+        if idx is not None:
+            return [idx]
+        return list(self._exact.get(normalize_role(query), ()))
+
+    def containing(self, query):
+        """
+        Indexes whose lowercased name contains the query, or failing that,
+        whose normalized name contains the normalized query.
+        """
+        q_lower = query.lower()
+        q_norm = normalize_role(query)
+        if not q_norm and not q_lower.strip():
+            return []
+
+        if len(q_lower) < 3:
+            pool = range(len(self.names))
+        else:
+            pool = None
+            # Grams inside the query (not the padded edges) must all be present
+            for gram in {q_lower[i:i + 3] for i in range(len(q_lower) - 2)}:
+                postings = self._grams.get(gram, set())
+                pool = postings if pool is None else pool & postings
+                if not pool:
+                    break
+            if q_norm and q_norm != q_lower:
+                norm_pool = None
+                for gram in {q_norm[i:i + 3] for i in range(len(q_norm) - 2)}:
+                    postings = self._grams.get(gram, set())
+                    norm_pool = postings if norm_pool is None else norm_pool & postings
+                    if not norm_pool:
+                        break
+                pool = (pool or set()) | (norm_pool or set())
+            pool = sorted(pool or ())
+
+        # Literal containment first; normalized containment only as a fallback
+        raw = [i for i in pool if q_lower in self.names_lower[i]]
+        if raw or not q_norm:
+            return raw
+        return [i for i in pool if q_norm in self.normalized[i]]
+
+    def prefix(self, query):
+        """Shortest name starting with the normalized query, or None."""
+        node = self._trie
+        for ch in normalize_role(query):
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node.get(None) if node is not self._trie else None
+
+    def fuzzy(self, query):
+        """Most similar name by trigram overlap (Dice), or None below FUZZY_THRESHOLD."""
+        q_norm = normalize_role(query)
+        if not q_norm:
+            return None
+        q_grams = _trigrams(q_norm)
+        shared = {}
+        for gram in q_grams:
+            for idx in self._norm_grams.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+
+        best, best_score = None, FUZZY_THRESHOLD
+        for idx, count in shared.items():
+            score = 2 * count / (len(q_grams) + self._norm_gram_counts[idx])
+            if score > best_score or (score == best_score and best is not None and idx < best):
+                best, best_score = idx, score
+        return best
+
+    def resolve(self, query):
+        """
+        Best single index for a query: exact name, alias, prefix, then fuzzy.
+        Returns None if nothing is close enough.
+        """
+        if not query or not query.strip():
+            return None
+        ids = self.exact(query)
+        if ids:
+            return ids[0]
+        idx = self._aliases.get(normalize_role(query))
+        if idx is not None:
+            return idx
+        idx = self.prefix(query)
+        if idx is not None:
+            return idx
+        return self.fuzzy(query)
+
+    def _lookup_phrase(self, phrase, size, start):
+        ids = self._exact.get(phrase)
+        if ids:
+            return (0, -size, start, ids[0])
+        idx = self._aliases.get(phrase)
+        if idx is not None:
+            return (1, -size, start, idx)
+        return None
+
+    def find_in_text(self, text):
+        """
+        Find a role mentioned in free text (whole words only). Full names win
+        over aliases, then longer phrases, then earlier mentions.
+        """
+        tokens = normalize_role(text).split()
+        best = None  # (is_alias, -words, position, index)
+        for start in range(len(tokens)):
+            for size in range(min(self._max_words, len(tokens) - start), 0, -1):
+                words = tokens[start:start + size]
+                candidate = self._lookup_phrase(" ".join(words), size, start)
+                if candidate is None and words[-1].endswith('s'):
+                    # Plural mention: "data scientists"
+                    candidate = self._lookup_phrase(" ".join(words[:-1] + [words[-1][:-1]]), size, start)
+                if candidate is None:
+                    continue
+                if best is None or candidate < best:
+                    best = candidate
+                break
+        return best[3] if best else None
@@ -0,0 +1,292 @@
+"""
+Skill matching without spaCy: the skill phrases are compiled into an Aho-Corasick
+automaton over lowercased tokens and run directly over resume text.
+
+The tokenizer follows the rules of spaCy's English tokenizer closely enough
+that matches line up with PhraseMatcher(attr="LOWER") in practice;
+SkillExtractor's "parity" engine runs both and reports any difference.
+"""
+import re
+import unicodedata
+from collections import deque
+
+
+def _char_class(category):
+    """Regex character class body (as ranges) with every character of a Unicode category."""
+    ranges = []
+    for code in range(0x1FB00):
+        if unicodedata.category(chr(code)) != category:
+            continue
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ''.join(re.escape(chr(a)) if a == b else f'{re.escape(chr(a))}-{re.escape(chr(b))}' for a, b in ranges)
+
+
+# Character classes of spaCy's English tokenizer rules
+_ALPHA = r'^\W\d_'
+_LOWER = 'a-zß-öø-ÿ'
+_UPPER = 'A-ZÀ-ÖØ-Þ'
+_QUOTES = '\'"”“`‘´’‚,„»«「」『』（）〔〕【】《》〈〉⟦⟧'
+_PUNCT = r'…,:;!?¿؟¡()\[\]{}<>_#*&。？！，、；：～·।،۔؛٪'
+_ICONS = _char_class('So')
+_CURRENCY = r'$£€¥฿₽﷼₴₠₡₢₣₤₥₦₧₨₩₪₫₭₮₯₰₱₲₳₵₶₷₸₹₺₻₼₾₿'
+_HYPHENS = '-|–|—|--|---|——|~'
+_UNITS = ('km|km²|km³|m|m²|m³|dm|dm²|dm³|cm|cm²|cm³|mm|mm²|mm³|ha|µm|nm|yd|in|ft|kg|g|mg|µg|t|lb|oz'
+          '|m/s|km/h|kmh|mph|hPa|Pa|mbar|mb|MB|kb|KB|gb|GB|tb|TB|T|G|M|K|%')
+
+_PREFIX_RE = re.compile(
+    rf'^(?:§|%|=|—|–|\+(?![0-9])|……|\.\.+|\'\'|[{_PUNCT}]|[{_QUOTES}]|US\$|C\$|A\$|[{_CURRENCY}]|[{_ICONS}])'
+)
+_SUFFIX_RE = re.compile(
+    rf'(?:……|\.\.+|\'\'|\'[sS]|’[sS]|[{_PUNCT}]|[{_QUOTES}]|[{_ICONS}]|—|–'
+    rf'|(?<=[0-9])\+|(?<=°[FfCcKk])\.|(?<=[0-9])(?:US\$|C\$|A\$|[{_CURRENCY}])|(?<=[0-9])(?:{_UNITS})'
+    rf'|(?<=[0-9{_LOWER}%²\-+|{_PUNCT}{_QUOTES}])\.|(?<=[{_UPPER}][{_UPPER}])\.)$'
+)
+_INFIX_RE = re.compile(
+    rf'\.\.+|…|[{_ICONS}]|(?<=[0-9])[+\-*^](?=[0-9-])'
+    rf'|(?<=[{_LOWER}{_QUOTES}])\.(?=[{_UPPER}{_QUOTES}])'
+    rf'|(?<=[{_ALPHA}]),(?=[{_ALPHA}])'
+    rf'|(?<=[^\W_])(?:{_HYPHENS})(?=[{_ALPHA}])'
+    rf'|(?<=[^\W_])[:<>=/](?=[{_ALPHA}])'
+)
+# Infixes need one of these characters; most tokens have none and skip the infix search
+_INFIX_CHARS_RE = re.compile(rf'[.…,~:<>=/+\-*^–—{_ICONS}]')
+_SUFFIX_TAIL = 8
+_PLAIN_WORD_RE = re.compile(r'[A-Za-z]+')
+
+# Host names and URLs stay one token ("node.js/react" is not split into skills)
+_LABEL = r'[A-Za-z0-9¡-￿]'
+_URL_RE = re.compile(
+    rf'^(?:[\w+\-.]{{2,}}://)?(?:\S+(?::\S*)?@)?'
+    rf'(?:\d{{1,3}}(?:\.\d{{1,3}}){{3}}|(?:(?:{_LABEL}[A-Za-z0-9¡-￿_-]{{0,62}})?{_LABEL}\.)+'
+    rf'(?:(?![{_UPPER}])[{_ALPHA}]){{2,63}})(?::\d{{2,5}})?(?:[/?#]\S*)?$'
+)
+
+# Tokenizer exceptions that change where tokens start or end
+# (orth -> offsets of the splits inside it)
+_SPECIAL_CASES = {}
+for _orth in (
+    # emoticons
+    "(*_*)", "(-8", "(-:", "(-;", "(-_-)", "(._.)", "(:", "(;", "(=", "(>_<)", "(^_^)", "(o:", "(¬_¬)",
+    ")-:", "):", "-_-", "-__-", "._.", "0.0", "0.o", "0_0", "0_o", "8)", "8-)", "8-D", "8D",
+    ":'(", ":')", ":'-(", ":'-)", ":(", ":((", ":(((", ":()", ":)", ":))", ":)))", ":*", ":-(", ":-((",
+    ":-(((", ":-)", ":-))", ":-)))", ":-*", ":-/", ":-0", ":-3", ":->", ":-D", ":-O", ":-P", ":-X",
+    ":-]", ":-o", ":-p", ":-x", ":-|", ":-}", ":/", ":0", ":1", ":3", ":>", ":D", ":O", ":P", ":X",
+    ":]", ":o", ":o)", ":p", ":x", ":|", ":}", ";)", ";-)", ";-D", ";D", ";_;", "<.<", "</3", "<3",
+    "<33", "<333", "=(", "=)", "=/", "=3", "=D", "=[", "=]", "=|", ">.<", ">.>", ">:(", ">:o",
+    "><(((*>", "@_@", "O.O", "O.o", "O_O", "O_o", "V.V", "V_V", "XD", "XDD", "[-:", "[:", "[=", "]=",
+    "^_^", "^__^", "^___^", "o.0", "o.O", "o.o", "o_0", "o_O", "o_o", "v.v", "v_v", "xD", "xDD",
+    # abbreviations keeping their period
+    "C++", "and/or", "w/o", "°c.", "°f.", "°k.", "°C.", "°F.", "°K.", "ä.", "ö.", "ü.",
+    "a.m.", "p.m.", "e.g.", "E.g.", "E.G.", "i.e.", "I.e.", "I.E.", "vs.", "v.s.", "co.", "Co.",
+    "Adm.", "Bros.", "Corp.", "D.C.", "Dr.", "Gen.", "Gov.", "Inc.", "Jr.", "Ltd.", "Md.", "Messrs.",
+    "Mo.", "Mont.", "Mr.", "Mrs.", "Ms.", "Mt.", "Ph.D.", "Prof.", "Rep.", "Rev.", "Sen.", "St.",
+    "Jan.", "Feb.", "Mar.", "Apr.", "Jun.", "Jul.", "Aug.", "Sep.", "Sept.", "Oct.", "Nov.", "Dec.",
+    "N.C.", "N.D.", "N.H.", "N.J.", "N.M.", "N.Y.", "S.C.", "Ak.", "Ala.", "Ariz.", "Ark.", "Calif.",
+    "Colo.", "Conn.", "Del.", "Fla.", "Ga.", "Ia.", "Id.", "Ill.", "Ind.", "Kan.", "Kans.", "Ky.",
+    "La.", "Mass.", "Mich.", "Minn.", "Miss.", "Neb.", "Nebr.", "Nev.", "Okla.", "Ore.", "Pa.",
+    "Tenn.", "Va.", "Wash.", "Wis.",
+):
+    _SPECIAL_CASES[_orth] = ()
+for _letter in "abcdefghijklmnopqrstuvwxyz":
+    _SPECIAL_CASES[_letter + "."] = ()
+for _hour in range(1, 13):
+    for _suffix in ("a.m.", "am", "p.m.", "pm"):
+        _SPECIAL_CASES[f"{_hour}{_suffix}"] = (len(str(_hour)),)
+# Contractions, with and without the apostrophe: "don't" -> "do", "n't"
+for _stem in ("do", "does", "did", "is", "are", "was", "were", "has", "have", "had", "could",
+              "would", "should", "ca", "wo", "ai", "need", "might", "must", "sha", "may", "ought", "dare"):
+    for _cased in (_stem, _stem.capitalize()):
+        for _apostrophe in ("'", "’", ""):
+            _SPECIAL_CASES[f"{_cased}n{_apostrophe}t"] = (len(_stem),)
+for _pronoun in ("i", "you", "he", "she", "it", "we", "they", "that", "there", "what", "who",
+                 "where", "when", "why", "how", "this", "these", "those"):
+    for _cased in (_pronoun, _pronoun.capitalize()):
+        for _ending in ("m", "re", "ve", "ll", "d", "s"):
+            for _apostrophe in ("'", "’"):
+                _SPECIAL_CASES.setdefault(f"{_cased}{_apostrophe}{_ending}", (len(_pronoun),))
+
+
+def _special_case(string, start, specials=_SPECIAL_CASES):
+    """Token spans of a tokenizer exception, or None."""
+    splits = specials.get(string)
+    if splits is None:
+        return None
+    bounds = (0,) + splits + (len(string),)
+    return [(start + a, start + b) for a, b in zip(bounds, bounds[1:])]
+
+
+def _find_suffix(string, pre_len):
+    """Length of the suffix of string[pre_len:] (0 if none)."""
+    if pre_len >= len(string):
+        return 0
+    # Suffixes are short: search the tail, with the characters before it as lookbehind context
+    tail = len(string) - _SUFFIX_TAIL
+    if tail > pre_len:
+        suffix = _SUFFIX_RE.search(string, tail)
+        if suffix is None or suffix.start() > tail:
+            return len(suffix.group()) if suffix else 0
+    suffix = _SUFFIX_RE.search(string[pre_len:])
+    return len(suffix.group()) if suffix else 0
+
+
+def _split_affixes(text, start, end, spans, specials=_SPECIAL_CASES):
+    """Append the token spans of the whitespace-free text[start:end] to `spans`."""
+    suffixes = []
+    while start < end:
+        string = text[start:end]
+        special = _special_case(string, start, specials)
+        if special is not None:
+            spans.extend(special)
+            start = end
+            break
+        prefix = _PREFIX_RE.match(string)
+        pre_len = prefix.end() if prefix else 0
+        suf_len = _find_suffix(string, pre_len)
+        if pre_len and string[pre_len:] in specials:
+            spans.append((start, start + pre_len))
+            start += pre_len
+            continue
+        if suf_len and string[:-suf_len] in specials:
+            suffixes.append((end - suf_len, end))
+            end -= suf_len
+            continue
+        if not pre_len and not suf_len:
+            break
+        if pre_len:
+            spans.append((start, start + pre_len))
+            start += pre_len
+        if suf_len:
+            suffixes.append((end - suf_len, end))
+            end -= suf_len
+
+    if start < end:
+        string = text[start:end]
+        if _URL_RE.match(string):
+            spans.append((start, end))
+        else:
+            position = start
+            infixes = _INFIX_RE.finditer(string) if _INFIX_CHARS_RE.search(string, 1) else ()
+            for infix in infixes:
+                infix_start, infix_end = start + infix.start(), start + infix.end()
+                if infix_start == start:
+                    continue
+                if infix_start != position:
+                    spans.append((position, infix_start))
+                if infix_start != infix_end:
+                    spans.append((infix_start, infix_end))
+                position = infix_end
+            if position < end:
+                spans.append((position, end))
+    spans.extend(reversed(suffixes))
+
+
+def _rule_tokens(string):
+    spans = []
+    _split_affixes(string, 0, len(string), spans, specials={})
+    return tuple(string[a:b] for a, b in spans)
+
+
+# Exceptions that the affix rules would split (":)", "C++"...) are found
+# again across tokens afterwards, as spaCy does: rule tokens -> orth
+_MERGED_SPECIALS = {}
+for _orth in _SPECIAL_CASES:
+    _tokens = _rule_tokens(_orth)
+    if len(_tokens) > 1:
+        _MERGED_SPECIALS[_tokens] = _orth
+_MERGE_STARTS = {tokens[0] for tokens in _MERGED_SPECIALS}
+_MERGE_MAX = max((len(tokens) for tokens in _MERGED_SPECIALS), default=0)
+
+
+def _merge_specials(text, spans, first):
+    """Retokenize exceptions split across spans[first:] (one whitespace-free chunk)."""
+    i = first
+    while i < len(spans) - 1:
+        if text[spans[i][0]:spans[i][1]] in _MERGE_STARTS:
+            for n in range(min(_MERGE_MAX, len(spans) - i), 1, -1):
+                orth = _MERGED_SPECIALS.get(tuple(text[a:b] for a, b in spans[i:i + n]))
+                if orth is not None:
+                    spans[i:i + n] = _special_case(orth, spans[i][0])
+                    break
+        i += 1
+
+
+def tokenize(text):
+    """Character spans (start, end) of the tokens of `text`."""
+    spans = []
+    for word in re.finditer(r'\S+', text):
+        # Fast path: plain words are single tokens unless they are exceptions ("cant")
+        if _PLAIN_WORD_RE.fullmatch(word.group()) and word.group() not in _SPECIAL_CASES:
+            spans.append(word.span())
+            continue
+        first = len(spans)
+        _split_affixes(text, word.start(), word.end(), spans)
+        if len(spans) - first > 1:
+            _merge_specials(text, spans, first)
+    return spans
+
+
+class SkillAutomaton:
+    """
+    Aho-Corasick automaton over lowercased tokens, built from {key: [phrases]}
+    (e.g. skill id -> the skill's name and aliases). Like PhraseMatcher, it
+    reports every occurrence, overlapping ones included.
+    """
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]  # per state: (key, number of tokens)
+        for key, phrases in patterns.items():
+            for phrase in phrases:
+                self._add(key, [phrase[a:b].lower() for a, b in tokenize(phrase)])
+        self._link()
+
+    def _add(self, key, tokens):
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        output = (key, len(tokens))
+        if output not in self._outputs[state]:
+            self._outputs[state].append(output)
+
+    def _link(self):
+        """Breadth-first failure links; each state's outputs include its suffix states'."""
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for token, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + [
+                    output for output in self._outputs[self._fail[next_state]]
+                    if output not in self._outputs[next_state]
+                ]
+
+    def find(self, text):
+        """Yields (key, start, end) character spans of every phrase in `text`."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        spans = tokenize(text)
+        state = 0
+        for i, (start, end) in enumerate(spans):
+            token = text[start:end].lower()
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if outputs[state]:
+                for key, length in outputs[state]:
+                    yield key, spans[i - length + 1][0], end
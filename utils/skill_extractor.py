@@ -1,60 +1,227 @@
-import json
 import os
+import pickle
+import threading
+import spacy
 from .nlp_processor import NLPProcessor
+from .skill_automaton import SkillAutomaton
+from .skill_vocabulary import get_default_vocabulary
 from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+
+# "spacy": PhraseMatcher over spaCy Docs; "automaton": pure-Python matcher over
+# raw text, no language model needed; "parity": spaCy results, checked against
+# the automaton with differences reported
+ENGINES = ("spacy", "automaton", "parity")
+
+# Precompiled matcher snapshot written by models/build_skill_matcher.py
+SKILL_MATCHER_FILE = 'skill_matcher.pkl'
+SNAPSHOT_VERSION = 3
+
+# Parity mode: distinct mismatches kept as samples, and printed (once each) at most
+PARITY_SAMPLES = 20
+PARITY_LOGGED = 100
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _model_id(nlp):
+    return f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+
+
+def build_matcher_snapshot(vocabulary, nlp=None):
+    """
+    Precompiled matchers for the taxonomy skills of `vocabulary`, keyed by
+    skill id: the PhraseMatcher patterns as tokens (tokenized by `nlp`, if
+    given) and the skill automaton, with the fingerprint they are checked
+    against on load.
+    """
+    phrases = vocabulary.taxonomy_phrases()
+    patterns = None
+    if nlp is not None:
+        patterns = [
+            (skill_id, [([t.text for t in doc], [bool(t.whitespace_) for t in doc])
+                        for doc in (nlp.make_doc(text) for text in texts)])
+            for skill_id, texts in phrases.items()
+        ]
+    return {
+        "version": SNAPSHOT_VERSION,
+        "vocabulary_hash": vocabulary.fingerprint,
+        "spacy_version": spacy.__version__,
+        "model": _model_id(nlp) if nlp is not None else None,
+        "patterns": patterns,
+        "automaton": SkillAutomaton(phrases)
+    }
+
 
 class SkillExtractor:
-    def __init__(self, nlp_processor):
-        self.nlp = nlp_processor.nlp
-        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        self.taxonomy = self._load_taxonomy()
-        self._initialize_matcher()
-
-    def _load_taxonomy(self):
-        """Load skills taxonomy from JSON file"""
+    def __init__(self, nlp_processor=None, engine="spacy", snapshot_path=None, vocabulary=None):
+        """
+        snapshot_path: precompiled matcher snapshot (default models/skill_matcher.pkl);
+        it is used when it matches the taxonomy, otherwise the matchers are built here
+        vocabulary: SkillVocabulary the skill ids refer to (default: the shared one)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown skill engine '{engine}'. Use one of: {', '.join(ENGINES)}")
+        if nlp_processor is None and engine != "automaton":
+            raise ValueError(f"The '{engine}' skill engine needs an NLPProcessor")
+        self.engine = engine
+        self.vocabulary = vocabulary or get_default_vocabulary()
+        self.taxonomy = self.vocabulary.taxonomy
+        self.phrases = self.vocabulary.taxonomy_phrases()
+        self.nlp = nlp_processor.nlp if nlp_processor is not None else None
+        self.snapshot_path = snapshot_path or os.path.join(_PROJECT_ROOT, 'models', SKILL_MATCHER_FILE)
+        self.snapshot_status = "built"
+        snapshot = self._load_snapshot()
+
+        self.automaton = None
+        if engine != "spacy":
+            self.automaton = snapshot["automaton"] if snapshot else SkillAutomaton(self.phrases)
+        self.matcher = None
+        if engine != "automaton":
+            self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+            if snapshot:
+                self._load_patterns(snapshot["patterns"])
+            else:
+                self._initialize_matcher()
+        self.parity = {"checked": 0, "mismatched": 0, "distinct": 0, "last_mismatch": None, "samples": []}
+        self._parity_seen = set()
+        self._parity_lock = threading.Lock()
+
+    def _load_snapshot(self):
+        """
+        The precompiled snapshot if it matches the taxonomy (and the loaded
+        spaCy model), else None: the matchers are then built from scratch.
+        """
+        if not os.path.exists(self.snapshot_path):
+            return None
         try:
-            # Look for data in local data directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(current_dir)
-            data_path = os.path.join(project_root, 'data', 'skills_taxonomy.json')
-            
-            with open(data_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+            stale_reason = self._check_snapshot(snapshot)
+        except Exception as e:
+            stale_reason = f"unreadable: {e}"
+        if stale_reason:
+            print(f"Skill matcher snapshot is stale ({stale_reason}). "
+                  f"Run models/build_skill_matcher.py to refresh it.")
+            return None
+        self.snapshot_status = "loaded"
+        return snapshot
+
+    def _check_snapshot(self, snapshot):
+        """Return why the snapshot is stale, or None if it can be used."""
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return "older snapshot format"
+        if snapshot.get("vocabulary_hash") != self.vocabulary.fingerprint:
+            return "skills_taxonomy.json or skill_aliases.json changed"
+        if self.engine != "automaton":
+            # Patterns were tokenized by a specific model's tokenizer
+            if snapshot.get("patterns") is None:
+                return "built without the spaCy model"
+            if snapshot.get("spacy_version") != spacy.__version__:
+                return f"built with spaCy {snapshot.get('spacy_version')}"
+            if snapshot.get("model") != _model_id(self.nlp):
+                return f"built for {snapshot.get('model')}"
+        return None
+
+    def _load_patterns(self, patterns):
+        """Add the snapshot's pre-tokenized patterns to the PhraseMatcher."""
+        vocab = self.nlp.vocab
+        for skill_id, docs in patterns:
+            self.matcher.add(str(skill_id), [Doc(vocab, words=words, spaces=spaces) for words, spaces in docs])
 
     def _initialize_matcher(self):
-        """Initialize Spacy PhraseMatcher with skills"""
-        for category, skills in self.taxonomy.items():
-            patterns = [self.nlp.make_doc(text) for text in skills]
-            self.matcher.add(category, patterns)
+        """Initialize Spacy PhraseMatcher with every skill's name and aliases, keyed by skill id"""
+        for skill_id, texts in self.phrases.items():
+            patterns = [self.nlp.make_doc(text) for text in texts]
+            self.matcher.add(str(skill_id), patterns)
 
     def extract_skills(self, doc):
         """
-        Extract skills from Spacy Doc object.
+        Extract skills from Spacy Doc object, or from raw text.
+        Skills are reported by their canonical name, aliases included.
         Returns:
             dict: {category: [skills]}
-            list: flat list of all unique skills
+            SkillList: flat list of all unique skills, with their ids in `.ids`
         """
+        if self.engine == "automaton":
+            # Docs hold cleaned text already; raw strings get the same cleanup
+            return self._result(self._automaton_ids(NLPProcessor.clean_text(doc) if isinstance(doc, str) else doc.text))
+
+        if isinstance(doc, str):
+            doc = self.nlp.make_doc(NLPProcessor.clean_text(doc))
+        result = self._result(self._matcher_ids(doc))
+        if self.engine == "parity":
+            self._check_parity(doc, result)
+        return result
+
+    def _matcher_ids(self, doc):
+        strings = self.nlp.vocab.strings
+        return {int(strings[match_id]) for match_id, _, _ in self.matcher(doc)}
+
+    def _automaton_ids(self, text):
+        return {skill_id for skill_id, _, _ in self.automaton.find(text)}
+
+    def _result(self, skill_ids):
+        """(categorized, flat) skills for a set of skill ids, in taxonomy order."""
+        vocabulary = self.vocabulary
+        flat_skills = vocabulary.skill_list(skill_ids)
         found_skills = {}
-        all_skills_set = set()
-
-        matches = self.matcher(doc)
-        
-        for match_id, start, end in matches:
-            string_id = self.nlp.vocab.strings[match_id]  # Category
-            span = doc[start:end]
-            skill_name = span.text
-            
-            # Add to category
-            if string_id not in found_skills:
-                found_skills[string_id] = set()
-            found_skills[string_id].add(skill_name)
-            
-            # Add to flat list
-            all_skills_set.add(skill_name)
-
-        # Convert sets to lists for JSON serialization
-        final_skills = {k: list(v) for k, v in found_skills.items()}
-        
-        return final_skills, list(all_skills_set)
+        for skill_id, skill_name in zip(sorted(skill_ids), flat_skills):
+            for category in vocabulary.categories(skill_id):
+                found_skills.setdefault(category, []).append(skill_name)
+        categorized = {c: found_skills[c] for c in vocabulary.category_order if c in found_skills}
+        return categorized, flat_skills
+
+    def compare_engines(self, doc, spacy_result=None):
+        """
+        Run both engines on `doc` and return the (category, skill) pairs only
+        one of them found: {"spacy_only": [...], "automaton_only": [...]}.
+        """
+        if self.matcher is None or self.automaton is None:
+            raise ValueError("compare_engines needs the 'parity' skill engine")
+        if isinstance(doc, str):
+            doc = self.nlp.make_doc(NLPProcessor.clean_text(doc))
+        if spacy_result is None:
+            spacy_result = self._result(self._matcher_ids(doc))
+        automaton_result = self._result(self._automaton_ids(doc.text))
+        spacy_pairs = {(c, s) for c, skills in spacy_result[0].items() for s in skills}
+        automaton_pairs = {(c, s) for c, skills in automaton_result[0].items() for s in skills}
+        return {
+            "spacy_only": sorted(spacy_pairs - automaton_pairs),
+            "automaton_only": sorted(automaton_pairs - spacy_pairs)
+        }
+
+    def _check_parity(self, doc, result):
+        """
+        Count a parity check. Each distinct mismatch is printed once and
+        counted in "distinct" (up to PARITY_LOGGED of them); the first
+        PARITY_SAMPLES are kept as samples.
+        """
+        diff = self.compare_engines(doc, result)
+        mismatched = bool(diff["spacy_only"] or diff["automaton_only"])
+        key = (tuple(diff["spacy_only"]), tuple(diff["automaton_only"]))
+        with self._parity_lock:
+            parity = self.parity
+            parity["checked"] += 1
+            if not mismatched:
+                return
+            parity["mismatched"] += 1
+            parity["last_mismatch"] = diff
+            if key in self._parity_seen or len(self._parity_seen) >= PARITY_LOGGED:
+                return
+            self._parity_seen.add(key)
+            parity["distinct"] = len(self._parity_seen)
+            if len(parity["samples"]) < PARITY_SAMPLES:
+                parity["samples"].append(diff)
+            capped = parity["distinct"] == PARITY_LOGGED
+        print(f"Skill engine mismatch: spaCy only {diff['spacy_only']}, automaton only {diff['automaton_only']}")
+        if capped:
+            print(f"Logged {PARITY_LOGGED} distinct skill engine mismatches; further ones are only counted.")
+
+    def extract_skills_batch(self, docs):
+        """
+        Extract skills from a stream of Docs (e.g. NLPProcessor.process_texts).
+        Yields: (categorized, flat) per doc, like extract_skills
+        """
+        for doc in docs:
+            yield self.extract_skills(doc)
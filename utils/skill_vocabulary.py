@@ -0,0 +1,163 @@
+import json
+import os
+import hashlib
+import threading
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SKILL_ALIASES_FILE = 'skill_aliases.json'
+
+
+def load_taxonomy():
+    """Load skills taxonomy from data/skills_taxonomy.json ({} if missing)"""
+    try:
+        with open(os.path.join(_PROJECT_ROOT, 'data', 'skills_taxonomy.json'), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def load_aliases(path=None):
+    """Load {canonical skill: [aliases]} from data/skill_aliases.json ({} if missing)"""
+    try:
+        with open(path or os.path.join(_PROJECT_ROOT, 'data', SKILL_ALIASES_FILE), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class SkillList(list):
+    """
+    Flat list of skill display names, as returned by the skill extractor,
+    carrying the canonical skill ids (`ids`) of the vocabulary it came from.
+    """
+    def __init__(self, names, ids=(), vocabulary=None):
+        super().__init__(names)
+        self.ids = frozenset(ids)
+        self.vocabulary = vocabulary
+
+    def __reduce__(self):
+        # The vocabulary stays in its own process; ids are only valid against it
+        return (SkillList, (list(self), self.ids))
+
+
+class SkillVocabulary:
+    """
+    Canonical skill names with stable integer ids, shared by the skill
+    extractor, the job matcher and the charts. Names are looked up case
+    insensitively and aliases ("ReactJS", "K8s") resolve to their canonical
+    skill's id. Ids are only ever appended, so they stay valid for the
+    lifetime of the vocabulary.
+    """
+    def __init__(self, taxonomy=None, aliases=None):
+        self.names = []          # id -> display name
+        self._categories = []    # id -> taxonomy categories
+        self._ids = {}           # lowercased name or alias -> id
+        self._canonical = {}     # lowercased alias -> canonical display name
+        self._phrases = {}       # id -> taxonomy names and aliases that spell the skill
+        self._lock = threading.Lock()
+        self.taxonomy = taxonomy or {}
+        self.aliases = aliases or {}
+        self.category_order = list(self.taxonomy)
+
+        for canonical, alias_names in self.aliases.items():
+            for alias in alias_names:
+                self._canonical[alias.lower()] = canonical
+        for category, skills in self.taxonomy.items():
+            for skill in skills:
+                self._add_phrase(self.intern(skill, category), skill)
+        for canonical, alias_names in self.aliases.items():
+            skill_id = self.intern(canonical)
+            # The canonical name is a phrase too, even where the taxonomy spells it differently
+            self._add_phrase(skill_id, canonical)
+            for alias in alias_names:
+                self._ids.setdefault(alias.lower(), skill_id)
+                self._add_phrase(skill_id, alias)
+        self.fingerprint = self._fingerprint()
+
+    @classmethod
+    def load(cls, taxonomy=None, aliases=None):
+        """Vocabulary for the project's skills taxonomy and alias file."""
+        return cls(load_taxonomy() if taxonomy is None else taxonomy,
+                   load_aliases() if aliases is None else aliases)
+
+    def _fingerprint(self):
+        payload = json.dumps([list(self.taxonomy.items()), list(self.aliases.items())], separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _add_phrase(self, skill_id, phrase):
+        phrases = self._phrases.setdefault(skill_id, [])
+        if phrase.lower() not in (p.lower() for p in phrases):
+            phrases.append(phrase)
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name, category=None):
+        """Id of `name` (or of the skill it is an alias of), added if new."""
+        key = name.lower()
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(key)
+                if skill_id is None:
+                    canonical = self._canonical.get(key, name)
+                    skill_id = self._ids.get(canonical.lower())
+                    if skill_id is None:
+                        skill_id = len(self.names)
+                        self.names.append(canonical)
+                        self._categories.append(())
+                        self._ids[canonical.lower()] = skill_id
+                    self._ids[key] = skill_id
+        if category is not None and category not in self._categories[skill_id]:
+            self._categories[skill_id] = self._categories[skill_id] + (category,)
+        return skill_id
+
+    def id(self, name):
+        """Id of `name`, or None if it isn't a known skill."""
+        return self._ids.get(name.lower())
+
+    def ids(self, names):
+        """Ids of the known skills among `names` (unknown names are skipped)."""
+        lookup = self._ids
+        return frozenset(skill_id for skill_id in map(lookup.get, (n.lower() for n in names)) if skill_id is not None)
+
+    def resolve(self, skills):
+        """
+        Ids of an extracted skill list: read straight off a SkillList built by
+        this vocabulary, otherwise looked up by name.
+        """
+        if isinstance(skills, SkillList) and skills.vocabulary is self:
+            return skills.ids
+        return self.ids(skills)
+
+    def name(self, skill_id):
+        """Canonical display name of a skill id."""
+        return self.names[skill_id]
+
+    def categories(self, skill_id):
+        """Taxonomy categories of a skill id (empty for skills outside the taxonomy)."""
+        return self._categories[skill_id]
+
+    def taxonomy_phrases(self):
+        """{id: [phrases]} of the taxonomy skills: their names and aliases, as written in the data files."""
+        return {skill_id: list(phrases) for skill_id, phrases in self._phrases.items() if self._categories[skill_id]}
+
+    def skill_list(self, ids):
+        """SkillList of the canonical names of `ids`, sorted by id."""
+        ids = sorted(ids)
+        return SkillList([self.names[i] for i in ids], ids, self)
+
+
+_default_vocabulary = None
+_default_lock = threading.Lock()
+
+
+def get_default_vocabulary():
+    """The process-wide vocabulary of the project's taxonomy, built on first use."""
+    global _default_vocabulary
+    if _default_vocabulary is None:
+        with _default_lock:
+            if _default_vocabulary is None:
+                _default_vocabulary = SkillVocabulary.load()
+    return _default_vocabulary
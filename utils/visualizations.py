@@ -30,24 +30,18 @@ def plot_job_match_scores(matches):
     )
     return fig
 
-def plot_skills_radar(extracted_skills, taxonomy):
+def plot_skills_radar(extracted_skills, vocabulary):
     """
     Create a radar chart showing skill distribution across categories
     """
-    # Count skills per category
-    categories = []
-    counts = []
-    
-    # Flatten skills for easy lookup
-    flat_skills = [s.lower() for s in extracted_skills]
-    
-    for category, skills in taxonomy.items():
-        cat_skills = [s.lower() for s in skills]
-        # Count how many of user's skills fall into this category
-        count = sum(1 for s in flat_skills if s in cat_skills)
-        if count > 0:
-            categories.append(category)
-            counts.append(count)
+    # Count skills per category, by skill id (aliases count once)
+    category_counts = {}
+    for skill_id in vocabulary.resolve(extracted_skills):
+        for category in vocabulary.categories(skill_id):
+            category_counts[category] = category_counts.get(category, 0) + 1
+
+    categories = [c for c in vocabulary.category_order if c in category_counts]
+    counts = [category_counts[c] for c in categories]
             
     if not categories:
         return None